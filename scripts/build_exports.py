@@ -9,17 +9,90 @@ Examples:
 from __future__ import annotations
 
 import argparse
+import hashlib
+import os
+import shutil
+import subprocess
 import sys
-from typing import List
+import tempfile
 from pathlib import Path
 
-from zotero_mcp import build_exports_content
+from zotero_mcp import _derive_output_basename, build_exports_content, get_file
 import json
-import re
-import base64
+try:
+    import orjson  # noqa: F401 - optional fast JSON parser
+except Exception:  # noqa: BLE001
+    orjson = None
 
+SUPPORTED_FORMATS = {"docx", "pdf"}
+_BIB_CACHE_MAX_DEFAULT = 32
 
-def main(argv: List[str] | None = None) -> int:
+
+def _cache_dir() -> Path:
+    return Path(os.getenv("XDG_CACHE_HOME", str(Path.home() / ".cache"))) / "zotero-mcp"
+
+
+def _prune_bib_cache(cache_dir: Path) -> None:
+    """Evict the oldest bib-*.json entries beyond the cap (mtime-based, like the artifact cache)."""
+    try:
+        max_entries = int(os.getenv("ZOTERO_BIB_CACHE_MAX", str(_BIB_CACHE_MAX_DEFAULT)))
+    except Exception:  # noqa: BLE001
+        max_entries = _BIB_CACHE_MAX_DEFAULT
+    try:
+        entries = sorted(cache_dir.glob("bib-*.json"), key=lambda p: p.stat().st_mtime)
+        for stale in entries[: max(0, len(entries) - max_entries)]:
+            stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _preconvert_bibliography(bib_content: str) -> str:
+    """Convert a BibTeX bibliography to CSL JSON once, cached by content hash.
+
+    Pandoc re-parses the bibliography on every build; the JSON form parses
+    significantly faster than BibTeX. Already-JSON content is returned as-is,
+    and on any conversion failure the original content is returned.
+    """
+    stripped = bib_content.lstrip()
+    if stripped.startswith("[") or stripped.startswith("{"):
+        return bib_content
+    digest = hashlib.blake2b(bib_content.encode("utf-8")).hexdigest()[:16]
+    cached = _cache_dir() / f"bib-{digest}.json"
+    try:
+        if cached.exists():
+            # Touch for LRU-style eviction in _prune_bib_cache
+            os.utime(cached)
+            return cached.read_text(encoding="utf-8")
+        pandoc = os.getenv("PANDOC_PATH") or shutil.which("pandoc")
+        if not pandoc:
+            return bib_content
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", suffix=".bib", delete=False, encoding="utf-8") as tf:
+            tf.write(bib_content)
+            src = tf.name
+        # Convert into a per-process temp file and publish with an atomic
+        # rename, so a concurrent invocation never reads a half-written cache
+        # entry. Same-directory keeps os.replace on one filesystem.
+        tmp_out = cached.with_name(f"{cached.name}.tmp{os.getpid()}")
+        try:
+            r = subprocess.run(
+                [pandoc, src, "-f", "bibtex", "-t", "csljson", "-o", str(tmp_out)],
+                capture_output=True,
+                text=True,
+            )
+        finally:
+            os.unlink(src)
+        if r.returncode == 0 and tmp_out.exists():
+            os.replace(tmp_out, cached)
+            _prune_bib_cache(cached.parent)
+            return cached.read_text(encoding="utf-8")
+        tmp_out.unlink(missing_ok=True)
+    except Exception:  # noqa: BLE001
+        pass
+    return bib_content
+
+
+def main(argv: list[str] | None = None) -> int:
     p = argparse.ArgumentParser(description="Run Pandoc builds via zotero_mcp.build_exports_content (content-first)")
     p.add_argument("-d", "--document", required=True, help="Path to Markdown/Doc to build")
     p.add_argument(
@@ -46,21 +119,61 @@ def main(argv: List[str] | None = None) -> int:
         default=".",
         help="Directory to write generated files (defaults to current directory)",
     )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild even when outputs are newer than all inputs",
+    )
     args = p.parse_args(argv)
 
-    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
-    # Read content-based inputs per repo policy (no cross-OS path mapping in tools)
-    doc_content = Path(args.document).read_text(encoding="utf-8")
+    # Single parse pass; dict.fromkeys dedupes while preserving order so a
+    # repeated format doesn't trigger a second Pandoc render.
+    formats = list(dict.fromkeys(f.strip() for f in args.formats.split(",") if f.strip()))
+    # Fail fast on unknown formats with an O(1) set lookup instead of letting
+    # the tool reject them after inputs have been read.
+    unknown = [f for f in formats if f not in SUPPORTED_FORMATS]
+    if unknown:
+        p.error(f"unsupported format(s): {', '.join(unknown)} (supported: {', '.join(sorted(SUPPORTED_FORMATS))})")
+    # Read content-based inputs per repo policy (no cross-OS path mapping in tools).
+    # Binary reads skip text-mode newline translation; the tool normalizes newlines itself.
+    doc_path = Path(args.document)
+    out_dir = Path(args.out_dir)
+    doc_content = doc_path.read_bytes().decode("utf-8")
     bib_content = None
     if args.bibliography:
-        bib_path = Path(args.bibliography)
-        if bib_path.exists():
-            bib_content = bib_path.read_text(encoding="utf-8")
+        # EAFP: read directly and treat a failed open as "no bibliography",
+        # saving the extra stat() of an exists() probe.
+        try:
+            bib_content = _preconvert_bibliography(Path(args.bibliography).read_bytes().decode("utf-8"))
+        except OSError:
+            pass
     csl_content = None
     if args.csl:
-        csl_path = Path(args.csl)
-        if csl_path.exists():
-            csl_content = csl_path.read_text(encoding="utf-8")
+        try:
+            csl_content = Path(args.csl).read_bytes().decode("utf-8")
+        except OSError:
+            pass
+    # Make-style short-circuit: skip the build when every requested output in
+    # out_dir already exists and is newer than all inputs (VS Code tasks
+    # frequently re-run without any edits). --force overrides.
+    if not args.force:
+        def _mtime(path: str | None) -> float:
+            if not path:
+                return 0.0
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0.0
+
+        newest_input = max(_mtime(args.document), _mtime(args.bibliography), _mtime(args.csl))
+        basename = _derive_output_basename(doc_content, args.output_basename)
+        targets = [out_dir / f"{basename}.{fmt}" for fmt in formats]
+        if all(_mtime(str(t)) >= newest_input for t in targets):
+            sys.stdout.write(
+                "Outputs up to date: " + ", ".join(str(t) for t in targets) + " (use --force to rebuild)\n"
+            )
+            return 0
+
     out = build_exports_content(
         doc_content,
         formats,  # type: ignore[arg-type]
@@ -71,37 +184,51 @@ def main(argv: List[str] | None = None) -> int:
         useCiteproc=True,
     )
 
-    print(out)
+    # Accumulate output and flush once; per-artifact print() calls each pay a
+    # write syscall on unbuffered/line-buffered stdout.
+    messages: list[str] = [out]
 
-    # Attempt to save outputs locally
-    m = re.search(r"```json\n(.*?)\n```", out, flags=re.DOTALL)
-    if not m:
+    def _flush() -> int:
+        sys.stdout.write("\n".join(messages) + "\n")
         return 0
-    payload = json.loads(m.group(1))
+
+    # Attempt to save outputs locally. The JSON payload sits in the last
+    # fenced ```json block; locate it with two find() calls instead of a
+    # backtracking DOTALL regex over the whole output.
+    start = out.find("```json\n")
+    if start == -1:
+        return _flush()
+    start += len("```json\n")
+    end = out.find("\n```", start)
+    if end == -1:
+        return _flush()
+    payload = orjson.loads(out[start:end]) if orjson is not None else json.loads(out[start:end])
     data = payload.get("result", payload)
     artifacts = data.get("artifacts", [])
     if not isinstance(artifacts, list):
-        return 0
-    out_dir = Path(args.out_dir)
+        return _flush()
     out_dir.mkdir(parents=True, exist_ok=True)
-    stem = Path(args.document).stem
+    stem = doc_path.stem
     for art in artifacts:
         fmt = art.get("format")
         if not fmt:
             continue
         filename = art.get("filename") or f"{stem}.{fmt}"
         target = out_dir / filename
-        content = art.get("content")
-        if content is None:
-            print(f"No content for {fmt}; skipped")
+        # Artifacts carry download tokens; since the build ran in-process we
+        # can copy the raw bytes directly from the file registry instead of
+        # decoding a base64 payload.
+        token = art.get("token")
+        info = get_file(token) if isinstance(token, str) else None
+        if info is None:
+            messages.append(f"No artifact file for {fmt}; skipped")
             continue
         try:
-            data_bytes = base64.b64decode(content)
-            target.write_bytes(data_bytes)
-            print(f"Wrote {target}")
+            shutil.copyfile(info.path, target)
+            messages.append(f"Wrote {target}")
         except Exception as e:  # noqa: BLE001
-            print(f"Failed to write {target}: {e}")
-    return 0
+            messages.append(f"Failed to write {target}: {e}")
+    return _flush()
 
 
 if __name__ == "__main__":
@@ -1,18 +1,32 @@
+import collections as _collections
+import functools
+import heapq
+import operator
 import os
+import secrets
 import typing as _typing
 import shutil
 import urllib
+import urllib.error
+import urllib.request
 import subprocess
+import threading
 from pathlib import Path
 import re as _re
 from typing import Any, Literal, Iterable, Mapping, TypedDict, Optional
 import time
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 try:
     import bibtexparser
 except Exception:  # noqa: BLE001
     bibtexparser = None
+try:
+    # Optional fast JSON codec for multi-megabyte CSL payloads; stdlib json
+    # is the fallback everywhere it is used.
+    import orjson as _fastjson
+except Exception:  # noqa: BLE001
+    _fastjson = None
 
 # Structured logger
 logger = logging.getLogger("zotero_mcp")
@@ -36,6 +50,34 @@ if not logger.handlers:
             pass
 
 
+# Hot-path regexes, compiled once at import. re's internal pattern cache
+# avoids recompilation but still pays a lookup per call.
+_WIN_ABS_RE = _re.compile(r"^[A-Za-z]:[\\/]")
+_SANITIZE_RE = _re.compile(r"[^A-Za-z0-9._-]+")
+_FRONT_MATTER_RE = _re.compile(r"^---\s*\n(.*?)\n---\s*\n", _re.DOTALL)
+_FM_TITLE_RE = _re.compile(r"^title:\s*['\"]?([^'\"\n]+)", _re.MULTILINE)
+_HEADING_RE = _re.compile(r"^#\s+([^\n]+)", _re.MULTILINE)
+_YEAR_RE = _re.compile(r"(?:19|20)\d{2}")
+_ZKEY_RE = _re.compile(r"[A-Z0-9]{8}")
+# Negative lookbehind skips escaped \@ so no separate removal pass is needed
+_RE_ATKEY = _re.compile(r"(?<!\\)@([A-Za-z0-9:_-]+)")
+_RE_LATEX_CITE = _re.compile(r"\\(?:cite|parencite|textcite|autocite)\{([^}]*)\}")
+_RE_TOKEN = _re.compile(r"[\w-]+")
+_JSON_FENCE_RE = _re.compile(r"```json\n(.*?)\n```", _re.DOTALL)
+# CSL spellings accepted as a DOI/URL for reference validation
+_DOI_URL_KEYS = frozenset(("DOI", "doi", "URL", "url"))
+_TY_RE = _re.compile(r"(?m)^TY\s*-")
+
+
+# Drive mount roots don't change at runtime, so remember which candidate
+# (if any) exists per (env_root, drive) — including the negative result —
+# instead of re-stat()ing up to three roots for every distinct path.
+_DRIVE_ROOT_CACHE: dict[tuple[str | None, str], Path | None] = {}
+
+# os.name is fixed for the life of the process; avoid re-reading it per call.
+_IS_NT = os.name == "nt"
+
+
 # Path normalization helper for cross-platform compatibility
 def _normalize_path(path_str: str) -> Path:
     """Normalize file paths for cross-platform use.
@@ -50,37 +92,57 @@ def _normalize_path(path_str: str) -> Path:
     - ZOTERO_HOST_DRIVES_ROOT: Root under which Windows drives are mounted (e.g., /host_mnt or /mnt)
       If set, a path like C:\\Users\\foo becomes {ZOTERO_HOST_DRIVES_ROOT}/c/Users/foo.
     - ZOTERO_DOCS_BASE: Base directory to resolve relative paths from.
+
+    Results are memoized per (path, env config) so repeated lookups skip the
+    resolve()/exists() syscalls; env changes key a fresh entry automatically.
     """
     s = (path_str or "").strip().strip('"').strip("'")
+    return _normalize_path_cached(
+        s,
+        os.getenv("ZOTERO_HOST_DRIVES_ROOT") or os.getenv("HOST_DRIVES_ROOT"),
+        os.getenv("ZOTERO_DOCS_BASE"),
+        _IS_NT,
+    )
 
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_path_cached(s: str, env_root: str | None, docs_base: str | None, is_nt: bool) -> Path:
     # Detect Windows absolute path patterns like C:\\ or C:/
-    win_abs = bool(_re.match(r"^[A-Za-z]:[\\/]", s)) or s.startswith("\\\\")
+    drive_match = _WIN_ABS_RE.match(s)
+    win_abs = bool(drive_match) or s.startswith("\\\\")
 
     # If we're on non-Windows and the input is a Windows absolute path, try to map it
-    if os.name != "nt" and win_abs:
+    if not is_nt and win_abs:
         # Drive-letter based path (ignore UNC for now unless explicitly mapped)
-        if _re.match(r"^[A-Za-z]:[\\/]", s):
+        if drive_match:
             drive = s[0].lower()
             rest = s[2:].lstrip("\\/")
             rest_posix = rest.replace("\\", "/")
 
-            # Determine candidate drive roots to try
-            roots: list[tuple[Path, str]] = []
-            env_root = os.getenv("ZOTERO_HOST_DRIVES_ROOT") or os.getenv("HOST_DRIVES_ROOT")
-            if env_root:
-                roots.append((Path(env_root), "env"))
-            # Common Docker Desktop and WSL mount points
-            roots.extend([
-                (Path("/host_mnt"), "host_mnt"),  # Docker Desktop
-                (Path("/mnt"), "mnt"),            # WSL or Linux
-            ])
-
-            # Try root/drive (e.g., /host_mnt/c, /mnt/c)
-            for root, _tag in roots:
-                drive_root = root / drive
-                if drive_root.exists():
-                    cand = drive_root / rest_posix
-                    return cand
+            # Probe candidate drive roots once per (env_root, drive); both
+            # the winning root and "no root" are cached module-level.
+            cache_key = (env_root, drive)
+            if cache_key in _DRIVE_ROOT_CACHE:
+                drive_root = _DRIVE_ROOT_CACHE[cache_key]
+            else:
+                roots: list[tuple[Path, str]] = []
+                if env_root:
+                    roots.append((Path(env_root), "env"))
+                # Common Docker Desktop and WSL mount points
+                roots.extend([
+                    (Path("/host_mnt"), "host_mnt"),  # Docker Desktop
+                    (Path("/mnt"), "mnt"),            # WSL or Linux
+                ])
+                drive_root = None
+                # Try root/drive (e.g., /host_mnt/c, /mnt/c)
+                for root, _tag in roots:
+                    cand_root = root / drive
+                    if cand_root.exists():
+                        drive_root = cand_root
+                        break
+                _DRIVE_ROOT_CACHE[cache_key] = drive_root
+            if drive_root is not None:
+                return drive_root / rest_posix
 
             # Fallback: some setups expose /c directly
             direct = Path(f"/{drive}") / rest_posix
@@ -104,9 +166,8 @@ def _normalize_path(path_str: str) -> Path:
 
     # If path is relative and a base is provided, resolve against it
     if not p.is_absolute():
-        base = os.getenv("ZOTERO_DOCS_BASE")
-        if base:
-            p = Path(base) / p
+        if docs_base:
+            p = Path(docs_base) / p
 
     # Resolve to absolute path (handles relative paths and normalizes)
     try:
@@ -119,13 +180,63 @@ def _normalize_path(path_str: str) -> Path:
             pass
     return p
 
-# Simple in-memory TTL cache and rate limiter
-_CACHE: dict[str, tuple[float, Any]] = {}
+# Simple in-memory TTL cache (CLOCK/second-chance eviction) and rate limiter.
+# Reads only bump a per-key hit counter (capped at _CACHE_HIT_MAX) — cheaper
+# than reordering the dict on every hit and friendlier to concurrent
+# read-heavy use; eviction sweeps from the cold end, decrementing the counter
+# so entries hit K times survive K sweep passes. One-shot scan entries carry
+# no hits and go first, which keeps bursts of distinct queries from flushing
+# the hot set (LRU-K-style protection).
+_CACHE: "_collections.OrderedDict[str, tuple[float, Any]]" = _collections.OrderedDict()
+_CACHE_HITS: dict[str, int] = {}
+_CACHE_HIT_MAX = 2
+# Secondary index of "search:" keys so suggest_citations' local-first scan
+# walks only cached search results instead of the whole cache
+_CACHE_SEARCH_KEYS: set[str] = set()
+
+# TinyLFU-style admission: a tiny counting sketch (two hashes into a shared
+# byte table) tracks how often keys are looked up. When the cache is full, a
+# never-repeated key is not admitted, so one-shot user queries can't displace
+# recurring ones. Counters are halved periodically so the sketch ages.
+_CACHE_SKETCH = bytearray(4096)
+_CACHE_SKETCH_MASK = len(_CACHE_SKETCH) - 1
+_CACHE_SKETCH_ADDS = 0
+_CACHE_SKETCH_AGE_AT = 40960
+
+
+def _sketch_indices(key: str) -> tuple[int, int]:
+    h = hash(key)
+    return h & _CACHE_SKETCH_MASK, (h >> 12) & _CACHE_SKETCH_MASK
+
+
+def _sketch_record(key: str) -> None:
+    global _CACHE_SKETCH_ADDS
+    i1, i2 = _sketch_indices(key)
+    if _CACHE_SKETCH[i1] < 255:
+        _CACHE_SKETCH[i1] += 1
+    if _CACHE_SKETCH[i2] < 255:
+        _CACHE_SKETCH[i2] += 1
+    _CACHE_SKETCH_ADDS += 1
+    if _CACHE_SKETCH_ADDS >= _CACHE_SKETCH_AGE_AT:
+        _CACHE_SKETCH_ADDS = 0
+        for i, v in enumerate(_CACHE_SKETCH):
+            if v:
+                _CACHE_SKETCH[i] = v >> 1
+
+
+def _sketch_estimate(key: str) -> int:
+    i1, i2 = _sketch_indices(key)
+    return min(_CACHE_SKETCH[i1], _CACHE_SKETCH[i2])
 _CACHE_TTL_DEFAULT = 30.0
 _RL_LAST: dict[str, float] = {}
 _CACHE_MAX_ENTRIES_DEFAULT = 200
 
 
+# The three config helpers below are memoized: they run on every cache
+# access / rate-limited call, and the env cannot change under a running
+# server. Tests or long-lived embedders can call _reload_config() after
+# mutating the environment.
+@functools.lru_cache(maxsize=1)
 def _cache_ttl() -> float:
     try:
         v = float(os.getenv("ZOTERO_CACHE_TTL", ""))
@@ -136,30 +247,75 @@ def _cache_ttl() -> float:
     return _CACHE_TTL_DEFAULT
 
 
+@functools.lru_cache(maxsize=1)
+def _cache_max_entries() -> int:
+    try:
+        return int(os.getenv("ZOTERO_CACHE_MAX", str(_CACHE_MAX_ENTRIES_DEFAULT)))
+    except Exception:
+        return _CACHE_MAX_ENTRIES_DEFAULT
+
+
+def _reload_config() -> None:
+    """Re-read cache/rate-limit env config (primarily for tests)."""
+    _cache_ttl.cache_clear()
+    _cache_max_entries.cache_clear()
+    _rate_min_interval.cache_clear()
+
+
 def _cache_get(key: str) -> Any | None:
     ttl = _cache_ttl()
     now = time.monotonic()
+    _sketch_record(key)
     hit = _CACHE.get(key)
     if hit and (now - hit[0]) < ttl:
+        # Bump the hit counter; each hit (up to the cap) buys one more
+        # survival pass through the eviction sweep
+        hits = _CACHE_HITS.get(key, 0)
+        if hits < _CACHE_HIT_MAX:
+            _CACHE_HITS[key] = hits + 1
         return hit[1]
     return None
 
 
 def _cache_set(key: str, value: Any) -> None:
+    max_entries = _cache_max_entries()
+    # Admission control: with the cache at capacity, only keys the sketch has
+    # seen looked up more than once earn a slot (every set is preceded by a
+    # _cache_get miss, so a repeat query reaches estimate 2).
+    if (
+        max_entries > 0
+        and len(_CACHE) >= max_entries
+        and key not in _CACHE
+        and _sketch_estimate(key) < 2
+    ):
+        return
     _CACHE[key] = (time.monotonic(), value)
-    # Evict oldest entries if cache grows too large
-    try:
-        max_entries = int(os.getenv("ZOTERO_CACHE_MAX", str(_CACHE_MAX_ENTRIES_DEFAULT)))
-    except Exception:
-        max_entries = _CACHE_MAX_ENTRIES_DEFAULT
+    _CACHE.move_to_end(key)
+    _CACHE_HITS.pop(key, None)
+    if key.startswith("search:"):
+        _CACHE_SEARCH_KEYS.add(key)
+    # Evict entries if cache grows too large (CLOCK sweep from the cold end)
     if max_entries > 0 and len(_CACHE) > max_entries:
-        # drop oldest ~10% to keep simple
+        # Batch-evict ~10% below the cap so a burst of inserts doesn't pay
+        # an eviction sweep on every call; ref bits still grant a second
+        # chance during the sweep.
         n_drop = max(1, max_entries // 10)
-        oldest = sorted(_CACHE.items(), key=lambda kv: kv[1][0])[:n_drop]
-        for k, _ in oldest:
-            _CACHE.pop(k, None)
+        floor = max_entries - n_drop
+        while len(_CACHE) > floor:
+            victim, entry = _CACHE.popitem(last=False)
+            hits = _CACHE_HITS.get(victim, 0)
+            if hits > 0:
+                # Spend one hit and recycle to the hot end
+                if hits == 1:
+                    del _CACHE_HITS[victim]
+                else:
+                    _CACHE_HITS[victim] = hits - 1
+                _CACHE[victim] = entry
+            else:
+                _CACHE_SEARCH_KEYS.discard(victim)
 
 
+@functools.lru_cache(maxsize=1)
 def _rate_min_interval() -> float:
     try:
         v = float(os.getenv("ZOTERO_RATE_MIN_INTERVAL", ""))
@@ -206,7 +362,30 @@ class ExportResultModel(TypedDict):
 
 from mcp.server.fastmcp import FastMCP
 
-from zotero_mcp.client import get_attachment_details, get_zotero_client
+from zotero_mcp.client import get_attachment_details
+from zotero_mcp.client import get_zotero_client as _build_zotero_client
+
+# Process-wide client, keyed on the env config it was built from so a
+# changed library id/key/mode transparently rebuilds it. Every tool call
+# previously re-ran client construction (env validation plus pyzotero setup).
+_CLIENT_SINGLETON: tuple[tuple[str | None, ...], Any] | None = None
+
+
+def get_zotero_client() -> Any:
+    """Return a shared Zotero client, rebuilt only when env config changes."""
+    global _CLIENT_SINGLETON
+    env_key = (
+        os.getenv("ZOTERO_LIBRARY_ID"),
+        os.getenv("ZOTERO_LIBRARY_TYPE"),
+        os.getenv("ZOTERO_API_KEY"),
+        os.getenv("ZOTERO_LOCAL"),
+        os.getenv("ZOTERO_REQUEST_TIMEOUT"),
+    )
+    if _CLIENT_SINGLETON is not None and _CLIENT_SINGLETON[0] == env_key:
+        return _CLIENT_SINGLETON[1]
+    client = _build_zotero_client()
+    _CLIENT_SINGLETON = (env_key, client)
+    return client
 
 # File registry for download tokens
 @dataclass
@@ -221,6 +400,13 @@ class FileInfo:
 
 
 FILE_REGISTRY: dict[str, FileInfo] = {}
+# Min-heap of (created_at, token) so expiry sweeps pop only due entries
+# instead of scanning the whole registry. Entries are validated lazily
+# against FILE_REGISTRY when popped.
+_FILE_EXPIRY_HEAP: list[tuple[float, str]] = []
+# Registrations can now arrive from concurrent render threads; heappush on
+# the shared heap is a multi-step mutation, so serialize registry updates.
+_FILE_REGISTRY_LOCK = threading.Lock()
 FILE_TTL_SECONDS = int(os.getenv("MCP_FILE_TTL", "3600"))  # 1 hour default
 MCP_FILES_DIR = Path(os.getenv("MCP_FILES_DIR", "/tmp/mcp-files"))
 MCP_DELETE_AFTER_DOWNLOAD = os.getenv("MCP_DELETE_AFTER_DOWNLOAD", "false").lower() == "true"
@@ -228,19 +414,20 @@ MCP_DELETE_AFTER_DOWNLOAD = os.getenv("MCP_DELETE_AFTER_DOWNLOAD", "false").lowe
 
 def register_file(file_path: Path, filename: str, size: int, format: str) -> str:
     """Register a file for download and return a secure token."""
-    import secrets
-    
     # Ensure the base directory exists
     MCP_FILES_DIR.mkdir(parents=True, exist_ok=True)
     
     token = secrets.token_urlsafe(32)
-    FILE_REGISTRY[token] = FileInfo(
-        path=file_path,
-        filename=filename,
-        size=size,
-        format=format,
-        created_at=time.time(),
-    )
+    created_at = time.time()
+    with _FILE_REGISTRY_LOCK:
+        FILE_REGISTRY[token] = FileInfo(
+            path=file_path,
+            filename=filename,
+            size=size,
+            format=format,
+            created_at=created_at,
+        )
+        heapq.heappush(_FILE_EXPIRY_HEAP, (created_at, token))
     logger.debug(f"Registered file {filename} with token {token[:8]}...")
     return token
 
@@ -258,32 +445,140 @@ def get_file(token: str) -> FileInfo | None:
 
 def cleanup_file(token: str) -> None:
     """Remove file from registry and filesystem."""
-    if token in FILE_REGISTRY:
-        info = FILE_REGISTRY.pop(token)
+    with _FILE_REGISTRY_LOCK:
+        info = FILE_REGISTRY.pop(token, None)
+    # Filesystem work happens outside the lock; only registry state needs it
+    if info is not None:
         try:
             info.path.unlink(missing_ok=True)
-            # Try to remove parent directory if empty
-            try:
-                info.path.parent.rmdir()
-            except OSError:
-                pass  # Directory not empty or doesn't exist
+            # Remove the per-token parent directory if empty. Files sitting
+            # directly in MCP_FILES_DIR skip the probe — that directory must
+            # stay, so the rmdir would only ever raise.
+            parent = info.path.parent
+            if parent != MCP_FILES_DIR:
+                try:
+                    parent.rmdir()
+                except OSError:
+                    pass  # Directory not empty or doesn't exist
             logger.debug(f"Cleaned up file {info.filename} (token {token[:8]}...)")
         except Exception as e:
             logger.warning(f"Failed to cleanup file {info.filename}: {e}")
 
 
+# Disk-backed cache of built artifacts keyed by a content hash of all build
+# inputs. Editor workflows re-run builds on save with unchanged inputs; a hit
+# here skips Pandoc entirely.
+_BUILD_CACHE_MAX_DEFAULT = 32
+
+
+def _build_cache_enabled() -> bool:
+    return os.getenv("ZOTERO_BUILD_CACHE", "true").lower() in {"1", "true", "yes"}
+
+
+def _build_cache_dir() -> Path:
+    # Resolved per call so ZOTERO_BUILD_CACHE_DIR can redirect the cache at
+    # runtime (tests point it at a temp dir)
+    return Path(os.getenv("ZOTERO_BUILD_CACHE_DIR", str(Path.home() / ".cache" / "zotero-mcp" / "builds")))
+
+
+def _build_cache_key(parts: Iterable[str]) -> str:
+    import hashlib
+
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        h.update(p.encode("utf-8", errors="ignore"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _build_cache_get(key: str, fmt: str) -> Path | None:
+    cached = _build_cache_dir() / f"{key}.{fmt}"
+    try:
+        if cached.is_file():
+            # Touch for LRU-style eviction in _build_cache_put
+            now = time.time()
+            os.utime(cached, (now, now))
+            return cached
+    except Exception:  # noqa: BLE001
+        pass
+    return None
+
+
+def _build_cache_put(key: str, fmt: str, src: Path) -> None:
+    try:
+        cache_dir = _build_cache_dir()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(str(src), str(cache_dir / f"{key}.{fmt}"))
+        try:
+            max_entries = int(os.getenv("ZOTERO_BUILD_CACHE_MAX", str(_BUILD_CACHE_MAX_DEFAULT)))
+        except Exception:  # noqa: BLE001
+            max_entries = _BUILD_CACHE_MAX_DEFAULT
+        entries = sorted(cache_dir.iterdir(), key=lambda p: p.stat().st_mtime)
+        for stale in entries[: max(0, len(entries) - max_entries)]:
+            stale.unlink(missing_ok=True)
+    except Exception:  # noqa: BLE001
+        logger.debug("build cache put failed", exc_info=True)
+
+
 def cleanup_expired_files() -> int:
-    """Remove all files past TTL. Returns count of cleaned files."""
-    now = time.time()
-    expired = [
-        token for token, info in FILE_REGISTRY.items()
-        if now - info.created_at > FILE_TTL_SECONDS
-    ]
-    for token in expired:
+    """Remove all files past TTL. Returns count of cleaned files.
+
+    Pops due entries off the registration-time heap instead of scanning the
+    whole registry; tokens already removed (or whose created_at was refreshed
+    since registration) are skipped or re-indexed lazily.
+    """
+    threshold = time.time() - FILE_TTL_SECONDS
+    cleaned = 0
+    # Heap pops interleave with locked heappush from concurrent render
+    # threads, so take the same lock; it is released around cleanup_file,
+    # which re-acquires it for the registry pop.
+    while True:
+        with _FILE_REGISTRY_LOCK:
+            if not (_FILE_EXPIRY_HEAP and _FILE_EXPIRY_HEAP[0][0] < threshold):
+                break
+            _, token = heapq.heappop(_FILE_EXPIRY_HEAP)
+            info = FILE_REGISTRY.get(token)
+            if info is None:
+                continue  # already cleaned up elsewhere; stale heap entry
+            if info.created_at >= threshold:
+                # created_at moved forward since registration; re-index and keep
+                heapq.heappush(_FILE_EXPIRY_HEAP, (info.created_at, token))
+                continue
         cleanup_file(token)
-    if expired:
-        logger.info(f"Cleaned up {len(expired)} expired file(s)")
-    return len(expired)
+        cleaned += 1
+    if cleaned:
+        logger.info(f"Cleaned up {cleaned} expired file(s)")
+    return cleaned
+
+
+# Memoized per (runner, path): keyed on the active subprocess.run callable,
+# like the which/urlopen keyed caches, so a patched runner (tests swap it per
+# test) never serves answers probed under a different one.
+_TOOL_VERSION_CACHE: dict[tuple[Any, str], str | None] = {}
+_TOOL_VERSION_CACHE_MAX = 16
+
+
+def _tool_version(path: str) -> str | None:
+    """Return the first line of `path --version`, memoized per path.
+
+    A version probe forks a subprocess and the answer cannot change during
+    the process lifetime; monitoring systems poll zotero_health frequently.
+    """
+    runner = subprocess.run
+    key = (runner, path)
+    if key in _TOOL_VERSION_CACHE:
+        return _TOOL_VERSION_CACHE[key]
+    version: str | None = None
+    try:
+        r = runner([path, "--version"], capture_output=True, text=True)
+        if r.returncode == 0 and r.stdout:
+            version = r.stdout.splitlines()[0]
+    except Exception:  # noqa: BLE001
+        pass
+    if len(_TOOL_VERSION_CACHE) >= _TOOL_VERSION_CACHE_MAX:
+        _TOOL_VERSION_CACHE.pop(next(iter(_TOOL_VERSION_CACHE)))
+    _TOOL_VERSION_CACHE[key] = version
+    return version
 
 
 # Create an MCP server
@@ -334,20 +629,16 @@ def zotero_health() -> str:
             info["pandoc"] = found or "missing"
         pandoc_path = info["pandoc"]
         if isinstance(pandoc_path, str) and not pandoc_path.startswith("missing"):
-            r = subprocess.run([pandoc_path, "--version"], capture_output=True, text=True)
-            info["pandocVersion"] = r.stdout.splitlines()[0] if r.returncode == 0 and r.stdout else "unknown"
+            info["pandocVersion"] = _tool_version(pandoc_path) or "unknown"
     except Exception:  # noqa: BLE001
         info["pandoc"] = "error"
     # PDF engine detection (non-browser only)
     engine, engine_warnings = _detect_pdf_engine(os.getenv("PDF_ENGINE"))
     info["pdfEngine"] = engine or "missing"
     if engine:
-        try:
-            er = subprocess.run([engine, "--version"], capture_output=True, text=True)
-            if er.returncode == 0 and er.stdout:
-                info["pdfEngineVersion"] = er.stdout.splitlines()[0]
-        except Exception:  # noqa: BLE001
-            pass
+        engine_version = _tool_version(engine)
+        if engine_version:
+            info["pdfEngineVersion"] = engine_version
     if engine_warnings:
         info["pdfEngineWarnings"] = engine_warnings
     # Export behavior flags
@@ -360,6 +651,56 @@ def zotero_health() -> str:
     return "# Health\n" + _compact_json_block("result", info)
 
 
+# Single-pass HTML stripping for note content. A chain of str.replace()
+# calls copies the whole string once per tag; one alternation regex with a
+# dispatch table does it in a single pass/allocation.
+_HTML_TAG_RE = _re.compile(r"<(?:/?p|br|/?strong|/?em)>")
+_HTML_REPL = {
+    "<p>": "",
+    "</p>": "\n",
+    "<br>": "\n",
+    "<strong>": "**",
+    "</strong>": "**",
+    "<em>": "*",
+    "</em>": "*",
+}
+
+
+def _strip_simple_html(text: str) -> str:
+    """Strip/convert the simple HTML tags Zotero uses in notes (simple approach)."""
+    return _HTML_TAG_RE.sub(lambda m: _HTML_REPL[m.group(0)], text)
+
+
+# The reverse direction for plain-text notes: every **bold**/*italic* pair in
+# one pass each, instead of first-occurrence-only str.replace calls.
+_MD_BOLD_RE = _re.compile(r"\*\*(.+?)\*\*", _re.DOTALL)
+_MD_ITAL_RE = _re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)", _re.DOTALL)
+
+
+def _fmt_author(a: Any) -> str | None:
+    """Format one CSL entry author or Zotero creator for display.
+
+    Returns "Family, Given", bare "Family", the literal name, or None when
+    nothing usable is present. Accepts the key spellings of both CSL JSON
+    (family/given, last/first) and Zotero creators (lastName/firstName/name).
+    """
+    if not isinstance(a, dict):
+        return None
+    fam = a.get("family") or a.get("last") or a.get("lastName")
+    giv = a.get("given") or a.get("first") or a.get("firstName")
+    if fam and giv:
+        return f"{fam}, {giv}"
+    if fam:
+        return str(fam)
+    name = a.get("name")
+    return str(name) if name else None
+
+
+def _trunc(s: str, n: int = 150) -> str:
+    """Truncate to n characters with an ellipsis; short strings pass through unchanged."""
+    return s if len(s) <= n else s[: n - 3] + "..."
+
+
 def format_item(item: dict[str, Any]) -> str:
     """Format a Zotero item's metadata as a readable string optimized for LLM consumption"""
     data = item["data"]
@@ -369,13 +710,7 @@ def format_item(item: dict[str, Any]) -> str:
     # Special handling for notes
     if item_type == "note":
         # Get note content
-        note_content = data.get("note", "")
-        # Strip HTML tags for cleaner text (simple approach)
-        note_content = (
-            note_content.replace("<p>", "").replace("</p>", "\n").replace("<br>", "\n")
-        )
-        note_content = note_content.replace("<strong>", "**").replace("</strong>", "**")
-        note_content = note_content.replace("<em>", "*").replace("</em>", "*")
+        note_content = _strip_simple_html(data.get("note", ""))
 
         # Format note with clear sections
         formatted = [
@@ -412,7 +747,7 @@ def format_item(item: dict[str, Any]) -> str:
     ]
 
     # Creators with role differentiation
-    creators_by_role = {}
+    creators_by_role: dict[str, list[str]] = _collections.defaultdict(list)
     for creator in data.get("creators", []):
         role = creator.get("creatorType", "contributor")
         name = ""
@@ -422,8 +757,6 @@ def format_item(item: dict[str, Any]) -> str:
             name = creator["name"]
 
         if name:
-            if role not in creators_by_role:
-                creators_by_role[role] = []
             creators_by_role[role].append(name)
 
     for role, names in creators_by_role.items():
@@ -537,6 +870,102 @@ def get_item_fulltext(item_key: str) -> str:
         return f"Error retrieving item full text: {str(e)}"
 
 
+def _format_search_tags(data: dict[str, Any]) -> str | None:
+    """Render up to five tags as a markdown line, or None when the item has none."""
+    tags = data.get("tags")
+    if not tags:
+        return None
+    tag_list = [f"`{tag['tag']}`" for tag in tags[:5]]
+    if len(tags) > 5:
+        tag_list.append("...")
+    return f"\n**Tags**: {' '.join(tag_list)}"
+
+
+def _format_note_entry(data: dict[str, Any], item_key: str, idx: int) -> str:
+    """Format one note search hit as a numbered markdown entry."""
+    note_content = _strip_simple_html(data.get("note", ""))
+
+    # Extract a title from the first line if possible, otherwise use first few words
+    title_preview = ""
+    if note_content:
+        first_line = note_content.strip().split("\n", 1)[0].strip()
+        if first_line:
+            # Use first line if it's reasonably short, otherwise use first few words
+            if len(first_line) <= 50:
+                title_preview = first_line
+            else:
+                title_preview = " ".join(first_line.split()[:5]) + "..."
+
+    note_title = title_preview if title_preview else "Note"
+
+    # Get a preview of the note content (truncated)
+    preview = _trunc(note_content.strip())
+
+    entry = [
+        f"## {idx + 1}. 📝 {note_title}",
+        f"**Type**: Note | **Key**: `{item_key}`",
+        f"\n{preview}",
+    ]
+
+    # Add parent item reference if available
+    if parent_item := data.get("parentItem"):
+        entry.insert(2, f"**Parent Item**: `{parent_item}`")
+
+    if (tags_line := _format_search_tags(data)) is not None:
+        entry.append(tags_line)
+
+    return "\n".join(entry)
+
+
+def _format_regular_entry(data: dict[str, Any], item_key: str, item_type: str, idx: int) -> str:
+    """Format one non-note search hit as a numbered markdown entry."""
+    title = data.get("title", "Untitled")
+    date = data.get("date", "")
+
+    # Format primary creators (limited to first 3)
+    all_creators = data.get("creators", [])
+    creators = []
+    for creator in all_creators[:3]:
+        if "firstName" in creator and "lastName" in creator:
+            creators.append(f"{creator['lastName']}, {creator['firstName']}")
+        elif "name" in creator:
+            creators.append(creator["name"])
+
+    if len(all_creators) > 3:
+        creators.append("et al.")
+
+    creator_str = "; ".join(creators) if creators else "No authors"
+
+    # Get publication or source info
+    source = ""
+    if pub := data.get("publicationTitle"):
+        source = pub
+    elif book := data.get("bookTitle"):
+        source = f"In: {book}"
+    elif publisher := data.get("publisher"):
+        source = f"{publisher}"
+
+    # Get a brief abstract (truncated if too long)
+    abstract = _trunc(data.get("abstractNote", ""))
+
+    entry = [
+        f"## {idx + 1}. {title}",
+        f"**Type**: {item_type} | **Date**: {date} | **Key**: `{item_key}`",
+        f"**Authors**: {creator_str}",
+    ]
+
+    if source:
+        entry.append(f"**Source**: {source}")
+
+    if abstract:
+        entry.append(f"\n{abstract}")
+
+    if (tags_line := _format_search_tags(data)) is not None:
+        entry.append(tags_line)
+
+    return "\n".join(entry)
+
+
 @mcp.tool(
     name="zotero_search_items",
     # More detail can be added if useful: https://www.zotero.org/support/dev/web_api/v3/basics#searching
@@ -570,131 +999,27 @@ def search_items(
     if not results:
         return "No items found matching your query."
 
-    # Header with search info
-    header = [
-        f"# Search Results for: '{query}'",
-        f"Found {len(results)} items." + (f" Using tag filter: {tag}" if tag else ""),
-        "Use item keys with zotero_item_metadata or zotero_item_fulltext for more details.\n",
-    ]
+    # Stream the report into one buffer; collecting entries in a list and
+    # joining twice doubles the string traffic for large result sets.
+    import io as _io
+
+    buf = _io.StringIO()
+    buf.write(f"# Search Results for: '{query}'\n\n")
+    buf.write(f"Found {len(results)} items." + (f" Using tag filter: {tag}" if tag else ""))
+    buf.write("\n\nUse item keys with zotero_item_metadata or zotero_item_fulltext for more details.\n")
 
-    # Format results
-    formatted_results = []
     for i, item in enumerate(results):
         data = item["data"]
         item_key = item.get("key", "")
         item_type = data.get("itemType", "unknown")
 
-        # Special handling for notes
+        buf.write("\n\n")
         if item_type == "note":
-            # Get note content
-            note_content = data.get("note", "")
-            # Strip HTML tags for cleaner text (simple approach)
-            note_content = (
-                note_content.replace("<p>", "")
-                .replace("</p>", "\n")
-                .replace("<br>", "\n")
-            )
-            note_content = note_content.replace("<strong>", "**").replace(
-                "</strong>", "**"
-            )
-            note_content = note_content.replace("<em>", "*").replace("</em>", "*")
-
-            # Extract a title from the first line if possible, otherwise use first few words
-            title_preview = ""
-            if note_content:
-                lines = note_content.strip().split("\n")
-                first_line = lines[0].strip()
-                if first_line:
-                    # Use first line if it's reasonably short, otherwise use first few words
-                    if len(first_line) <= 50:
-                        title_preview = first_line
-                    else:
-                        words = first_line.split()
-                        title_preview = " ".join(words[:5]) + "..."
-
-            # Create a good title for the note
-            note_title = title_preview if title_preview else "Note"
-
-            # Get a preview of the note content (truncated)
-            preview = note_content.strip()
-            if len(preview) > 150:
-                preview = preview[:147] + "..."
-
-            # Format the note entry
-            entry = [
-                f"## {i + 1}. 📝 {note_title}",
-                f"**Type**: Note | **Key**: `{item_key}`",
-                f"\n{preview}",
-            ]
-
-            # Add parent item reference if available
-            if parent_item := data.get("parentItem"):
-                entry.insert(2, f"**Parent Item**: `{parent_item}`")
-
-            # Add tags if present (limited to first 5)
-            if tags := data.get("tags"):
-                tag_list = [f"`{tag['tag']}`" for tag in tags[:5]]
-                if len(tags) > 5:
-                    tag_list.append("...")
-                entry.append(f"\n**Tags**: {' '.join(tag_list)}")
-
-            formatted_results.append("\n".join(entry))
-            continue
-
-        # Regular item processing (non-notes)
-        title = data.get("title", "Untitled")
-        date = data.get("date", "")
-
-        # Format primary creators (limited to first 3)
-        creators = []
-        for creator in data.get("creators", [])[:3]:
-            if "firstName" in creator and "lastName" in creator:
-                creators.append(f"{creator['lastName']}, {creator['firstName']}")
-            elif "name" in creator:
-                creators.append(creator["name"])
-
-        if len(data.get("creators", [])) > 3:
-            creators.append("et al.")
-
-        creator_str = "; ".join(creators) if creators else "No authors"
-
-        # Get publication or source info
-        source = ""
-        if pub := data.get("publicationTitle"):
-            source = pub
-        elif book := data.get("bookTitle"):
-            source = f"In: {book}"
-        elif publisher := data.get("publisher"):
-            source = f"{publisher}"
-
-        # Get a brief abstract (truncated if too long)
-        abstract = data.get("abstractNote", "")
-        if len(abstract) > 150:
-            abstract = abstract[:147] + "..."
-
-        # Build formatted entry with markdown for better structure
-        entry = [
-            f"## {i + 1}. {title}",
-            f"**Type**: {item_type} | **Date**: {date} | **Key**: `{item_key}`",
-            f"**Authors**: {creator_str}",
-        ]
-
-        if source:
-            entry.append(f"**Source**: {source}")
-
-        if abstract:
-            entry.append(f"\n{abstract}")
-
-        # Add tags if present (limited to first 5)
-        if tags := data.get("tags"):
-            tag_list = [f"`{tag['tag']}`" for tag in tags[:5]]
-            if len(tags) > 5:
-                tag_list.append("...")
-            entry.append(f"\n**Tags**: {' '.join(tag_list)}")
-
-        formatted_results.append("\n".join(entry))
+            buf.write(_format_note_entry(data, item_key, i))
+        else:
+            buf.write(_format_regular_entry(data, item_key, item_type, i))
 
-    return "\n\n".join(header + formatted_results)
+    return buf.getvalue()
 
 
 # ------------------------
@@ -810,6 +1135,13 @@ def _format_error(prefix: str, e: Exception) -> str:
 
 def _compact_json_block(label: str, obj: dict[str, Any]) -> str:
     try:
+        if _fastjson is not None:
+            try:
+                # orjson's compact output matches the (',', ':') separators
+                return f"\n\n### {label}\n```json\n{_fastjson.dumps(obj).decode('utf-8')}\n```"
+            except TypeError:
+                # Types orjson won't serialize (e.g. tuples) take the stdlib path
+                pass
         import json as _json
 
         return f"\n\n### {label}\n```json\n{_json.dumps(obj, ensure_ascii=False, separators=(',', ':'))}\n```"
@@ -839,7 +1171,7 @@ class _DependencyError(RuntimeError):
 
 
 def _sanitize_basename(candidate: str) -> str:
-    cleaned = _re.sub(r"[^A-Za-z0-9._-]+", "_", (candidate or "").strip())
+    cleaned = _SANITIZE_RE.sub("_", (candidate or "").strip())
     cleaned = cleaned.strip("._-") or "document"
     return cleaned[:120]
 
@@ -849,28 +1181,37 @@ def _derive_output_basename(document: str | None, provided: str | None) -> str:
         return _sanitize_basename(provided)
 
     text = (document or "").lstrip("\ufeff")
-    front_match = _re.match(r"^---\s*\n(.*?)\n---\s*\n", text, flags=_re.DOTALL)
+    front_match = _FRONT_MATTER_RE.match(text)
     if front_match:
-        title_match = _re.search(r"^title:\s*['\"]?([^'\"\n]+)", front_match.group(1), flags=_re.MULTILINE)
+        title_match = _FM_TITLE_RE.search(front_match.group(1))
         if title_match:
             return _sanitize_basename(title_match.group(1))
 
-    heading_match = _re.search(r"^#\s+([^\n]+)", text, flags=_re.MULTILINE)
+    heading_match = _HEADING_RE.search(text)
     if heading_match:
         return _sanitize_basename(heading_match.group(1))
 
     return "document"
 
 
+# Dependency detection is memoized: shutil.which walks PATH and stats every
+# directory, and the answers cannot change for the life of the server. The
+# cached variants take the active `shutil.which` callable as part of the key,
+# so a replaced/monkeypatched resolver (as the tests do) keys fresh entries
+# instead of serving stale ones.
 def _ensure_pandoc() -> str:
-    explicit = os.getenv("PANDOC_PATH")
+    return _ensure_pandoc_cached(os.getenv("PANDOC_PATH"), shutil.which)
+
+
+@functools.lru_cache(maxsize=4)
+def _ensure_pandoc_cached(explicit: str | None, which_fn: Any) -> str:
     if explicit:
         exp_path = Path(explicit)
         if exp_path.exists():
             return str(exp_path)
         raise _DependencyError(f"PANDOC_PATH points to {explicit}, but the file does not exist.")
 
-    found = shutil.which("pandoc")
+    found = which_fn("pandoc")
     if found:
         return found
     raise _DependencyError(
@@ -881,50 +1222,66 @@ def _ensure_pandoc() -> str:
 def _detect_pdf_engine(
     requested: Literal["wkhtmltopdf", "weasyprint", "xelatex"] | None,
 ) -> tuple[str | None, list[str]]:
+    engine, warnings = _detect_pdf_engine_cached(
+        requested,
+        os.getenv("PDF_ENGINE"),
+        os.getenv("PDF_ENGINE_PATH"),
+        shutil.which,
+    )
+    # Hand back a fresh list so callers can append without touching the cache
+    return engine, list(warnings)
+
+
+@functools.lru_cache(maxsize=8)
+def _detect_pdf_engine_cached(
+    requested: str | None,
+    env_engine: str | None,
+    env_path: str | None,
+    which_fn: Any,
+) -> tuple[str | None, tuple[str, ...]]:
     warnings: list[str] = []
-    env_engine = os.getenv("PDF_ENGINE")
-    env_path = os.getenv("PDF_ENGINE_PATH")
+    candidates = ("wkhtmltopdf", "weasyprint", "xelatex")
+    candidate_set = frozenset(candidates)
 
-    def _path_supports(name: str) -> bool:
-        if not env_path:
-            return False
+    # Resolve what PDF_ENGINE_PATH (if any) points at once, instead of
+    # re-stat()ing and re-lowercasing the basename per candidate probe
+    path_engine: str | None = None
+    if env_path:
         ep = Path(env_path)
         if not ep.exists():
             warnings.append(f"PDF_ENGINE_PATH set to {env_path} but the file does not exist.")
-            return False
-        if env_engine:
-            return env_engine == name
-        return ep.name.lower().startswith(name)
+        elif env_engine:
+            path_engine = env_engine
+        else:
+            lowered = ep.name.lower()
+            path_engine = next((name for name in candidates if lowered.startswith(name)), None)
 
     def _is_available(name: str) -> bool:
-        if _path_supports(name):
-            return True
-        found = shutil.which(name)
-        return found is not None
+        return name == path_engine or which_fn(name) is not None
 
-    candidates = ("wkhtmltopdf", "weasyprint", "xelatex")
+    if env_engine in candidate_set and _is_available(env_engine):
+        return env_engine, tuple(warnings)
 
-    if env_engine in candidates and _is_available(env_engine):
-        return env_engine, warnings
-
-    if requested in candidates and _is_available(requested):
-        return requested, warnings
+    if requested in candidate_set and _is_available(requested):
+        return requested, tuple(warnings)
 
     for candidate in candidates:
         if _is_available(candidate):
-            return candidate, warnings
+            return candidate, tuple(warnings)
 
     warnings.append("No PDF engine found (wkhtmltopdf/weasyprint/xelatex). Pandoc may fail to produce PDF.")
-    return None, warnings
+    return None, tuple(warnings)
 
 
-@dataclass
+@dataclass(slots=True)
 class _ExportArtifact:
     format: Literal["docx", "pdf"]
     filename: str
     token: str
     downloadUrl: str
     size: int
+    # Immutable by contract, so the serialized form is computed once
+    _as_dict: dict[str, Any] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.format not in {"docx", "pdf"}:
@@ -937,9 +1294,7 @@ class _ExportArtifact:
             raise ValueError("downloadUrl must be a non-empty string")
         if not isinstance(self.size, int) or self.size < 0:
             raise ValueError("size must be a non-negative integer")
-
-    def as_dict(self) -> dict[str, Any]:
-        return {
+        self._as_dict = {
             "format": self.format,
             "filename": self.filename,
             "token": self.token,
@@ -947,9 +1302,51 @@ class _ExportArtifact:
             "size": self.size,
         }
 
+    def as_dict(self) -> dict[str, Any]:
+        return self._as_dict
+
 
 
 
+def _register_built_artifact(src: Path, final_filename: str, fmt: str, size: int, *, move: bool = True) -> _ExportArtifact:
+    """Place a built file in the download area and register it, returning the artifact."""
+    file_token = secrets.token_urlsafe(32)
+    token_dir = MCP_FILES_DIR / file_token
+    token_dir.mkdir(parents=True, exist_ok=True)
+    final_path = token_dir / final_filename
+    if move:
+        try:
+            # Builds stage inside MCP_FILES_DIR, so this is an O(1) rename
+            os.replace(src, final_path)
+        except OSError:
+            # Cross-device source (e.g. custom tempdir): fall back to copy+unlink
+            shutil.move(str(src), str(final_path))
+    else:
+        shutil.copyfile(str(src), str(final_path))
+
+    created_at = time.time()
+    with _FILE_REGISTRY_LOCK:
+        FILE_REGISTRY[file_token] = FileInfo(
+            path=final_path,
+            filename=final_filename,
+            size=size,
+            format=fmt,
+            created_at=created_at,
+        )
+        heapq.heappush(_FILE_EXPIRY_HEAP, (created_at, file_token))
+    logger.info(f"Registered file {final_filename} with token {file_token[:8]}... (registry size: {len(FILE_REGISTRY)})")
+
+    host = os.getenv("MCP_HOST", "localhost")
+    port = os.getenv("MCP_PORT", "9180")
+    return _ExportArtifact(
+        format=fmt,
+        filename=final_filename,
+        token=file_token,
+        downloadUrl=f"http://{host}:{port}/files/{file_token}",
+        size=size,
+    )
+
+
 def _log_startup_summary() -> None:
     """Emit a one-time log summary covering export dependencies."""
     if os.getenv("ZOTERO_SUPPRESS_STARTUP_LOG") == "1":
@@ -981,12 +1378,26 @@ def _ensure_csl_json(text: str) -> tuple[Any, list[str]]:
     """
     warnings: list[str] = []
     try:
-        import json as _json
+        if _fastjson is not None:
+            parsed: Any = _fastjson.loads(text)
+        else:
+            import json as _json
 
-        parsed: Any = _json.loads(text)
+            parsed = _json.loads(text)
     except Exception as e:  # noqa: BLE001
         return [], [f"INVALID_CSL_EXPORT: not JSON parseable ({e})"]
 
+    warnings.extend(_validate_csl_parsed(parsed))
+    return parsed, warnings
+
+
+def _validate_csl_parsed(parsed: Any) -> list[str]:
+    """Shape-check an already-parsed CSL JSON object, returning warnings.
+
+    Lets callers that produced the object themselves skip the round-trip
+    through text that _ensure_csl_json would re-parse.
+    """
+
     def _validate_list(lst: list[Any]) -> list[str]:
         w: list[str] = []
         # Check id presence on first few items
@@ -997,63 +1408,61 @@ def _ensure_csl_json(text: str) -> tuple[Any, list[str]]:
         return w
 
     if isinstance(parsed, list):
-        warnings.extend(_validate_list(parsed))
-        return parsed, warnings
+        return _validate_list(parsed)
     if isinstance(parsed, dict) and isinstance(parsed.get("items"), list):
-        warnings.extend(_validate_list(parsed["items"]))
-        return parsed, warnings
-    return parsed, ["INVALID_CSL_EXPORT: unexpected JSON shape (expected array or object with 'items')"]
+        return _validate_list(parsed["items"])
+    return ["INVALID_CSL_EXPORT: unexpected JSON shape (expected array or object with 'items')"]
 
 
 def _to_csl_entry(item: dict[str, Any]) -> dict[str, Any]:
-    """Best-effort mapping from Zotero native item to a minimal CSL entry."""
+    """Best-effort mapping from Zotero native item to a minimal CSL entry.
+
+    Runs once per item on full-library exports, so it is written to minimize
+    dict churn: one bound data.get, dict literals instead of incremental
+    __setitem__, and each field read exactly once.
+    """
     data = item.get("data", {}) if isinstance(item, dict) else {}
-    entry: dict[str, Any] = {}
+    get = data.get
     # id: prefer Better BibTeX-like id if present, else Zotero key
-    entry["id"] = (
-        data.get("citekey")
-        or item.get("key")
-        or data.get("key")
-        or str(item.get("id") or "")
-    )
-    entry["title"] = data.get("title")
+    entry: dict[str, Any] = {
+        "id": get("citekey") or item.get("key") or get("key") or str(item.get("id") or ""),
+        "title": get("title"),
+    }
     # authors
-    authors: list[dict[str, Any]] = []
-    for c in data.get("creators", []) or []:
-        if isinstance(c, dict):
-            fam = c.get("lastName") or c.get("family")
-            giv = c.get("firstName") or c.get("given")
-            if fam or giv:
-                a: dict[str, Any] = {}
+    creators = get("creators")
+    if creators:
+        authors: list[dict[str, Any]] = []
+        for c in creators:
+            if isinstance(c, dict):
+                fam = c.get("lastName") or c.get("family")
+                giv = c.get("firstName") or c.get("given")
                 if fam:
-                    a["family"] = fam
-                if giv:
-                    a["given"] = giv
-                authors.append(a)
-    if authors:
-        entry["author"] = authors
+                    authors.append({"family": fam, "given": giv} if giv else {"family": fam})
+                elif giv:
+                    authors.append({"given": giv})
+        if authors:
+            entry["author"] = authors
     # issued
-    yr: int | None = None
-    date = data.get("date") or data.get("year")
+    date = get("date") or get("year")
     if isinstance(date, str):
-        m = _re.search(r"(19|20)\\d{2}", date)
+        m = _YEAR_RE.search(date)
         if m:
             try:
-                yr = int(m.group(0))
+                entry["issued"] = {"date-parts": [[int(m.group(0))]]}
             except Exception:
-                yr = None
-    if yr is not None:
-        entry["issued"] = {"date-parts": [[yr]]}
+                pass
     # type (rough mapping)
-    t = data.get("itemType")
+    t = get("itemType")
     if t:
         # minimal, leave as-is; real mapping could be added later
         entry["type"] = "article-journal" if t == "journalArticle" else t
     # DOI/URL passthrough
-    if data.get("DOI"):
-        entry["DOI"] = data.get("DOI")
-    if data.get("url"):
-        entry["URL"] = data.get("url")
+    doi = get("DOI")
+    if doi:
+        entry["DOI"] = doi
+    url = get("url")
+    if url:
+        entry["URL"] = url
     return entry
 
 
@@ -1080,7 +1489,8 @@ def _normalize_json_input(value: Any, expect: str = "array") -> tuple[str, Any]:
     if isinstance(value, str):
         s = value
         try:
-            parsed = _json.loads(s or ("[]" if expect == "array" else "{}"))
+            raw = s or ("[]" if expect == "array" else "{}")
+            parsed = _fastjson.loads(raw) if _fastjson is not None else _json.loads(raw)
         except Exception as e:  # noqa: BLE001
             raise ValueError(f"Invalid JSON: {e}")
         # basic shape check
@@ -1140,33 +1550,41 @@ def get_collections(parentKey: str | None = None) -> str:
 
         # Build maps
         nodes: dict[str, dict[str, Any]] = {}
-        children_map: dict[str | None, list[str]] = {}
         for c in collections:
             data = c.get("data", {})
             key = data.get("key")
-            name = data.get("name") or data.get("collectionName") or "(unnamed)"
-            parent = data.get("parentCollection") or None
-            count = c.get("meta", {}).get("numItems")
-            if key:
-                nodes[key] = {
-                    "key": key,
-                    "name": name,
-                    "parentKey": parent,
-                    "itemCount": int(count) if isinstance(count, int) or (isinstance(count, str) and count.isdigit()) else count or 0,
-                }
-                children_map.setdefault(parent, []).append(key)
-
-        # Compute paths via DFS from roots (parentKey None or absent)
-        def build_paths(start_keys: list[str]) -> None:
-            stack: list[tuple[str, list[str]]] = [(k, [nodes[k]["name"]]) for k in start_keys]
-            while stack:
-                k, path_names = stack.pop()
-                nodes[k]["path"] = "/".join(path_names)
-                for child in children_map.get(k, []):
-                    stack.append((child, path_names + [nodes[child]["name"]]))
-
-        roots = children_map.get(None, [])
-        build_paths(roots)
+            if not key:
+                continue
+            # The API returns ints here; coerce the rare string via EAFP
+            # instead of chained type checks on every node
+            count = (c.get("meta") or {}).get("numItems", 0)
+            if type(count) is not int:
+                try:
+                    count = int(count)
+                except Exception:  # noqa: BLE001
+                    count = 0
+            nodes[key] = {
+                "key": key,
+                "name": data.get("name") or data.get("collectionName") or "(unnamed)",
+                "parentKey": data.get("parentCollection") or None,
+                "itemCount": count,
+            }
+
+        # Compute paths by walking parentKey chains with memoization into the
+        # node itself — each node is resolved once, with no per-edge list
+        # copies like the previous DFS. Zotero trees are shallow, so the
+        # recursion depth is bounded in practice.
+        def _path(k: str) -> str:
+            n = nodes[k]
+            cached_path = n.get("path")
+            if cached_path is not None:
+                return cached_path
+            p = n["parentKey"]
+            n["path"] = n["name"] if not p or p not in nodes else _path(p) + "/" + n["name"]
+            return n["path"]
+
+        for k in nodes:
+            _path(k)
 
         # If a parentKey was specified, we may need to also include the parent chain for path context
         if parentKey and parentKey not in nodes and isinstance(collections, list):
@@ -1180,8 +1598,10 @@ def get_collections(parentKey: str | None = None) -> str:
             for k in list(nodes.keys()):
                 nodes[k]["path"] = f"{pname}/" + nodes[k].get("path", nodes[k]["name"])  # type: ignore[index]
 
-        flat = list(nodes.values())
-        flat.sort(key=lambda n: (n.get("path", ""), n.get("name", "")))
+        # Decorate-sort-undecorate: extracts each node's sort key exactly once
+        # instead of invoking a lambda per comparison
+        # (the index tiebreaker keeps tuple comparison away from the dicts)
+        flat = [t[3] for t in sorted((n.get("path", ""), n.get("name", ""), i, n) for i, n in enumerate(nodes.values()))]
 
         header = [
             "# Collections",
@@ -1227,14 +1647,13 @@ def open_in_zotero(
         else:
             url = f"zotero://select/library/items/{itemKey}"
 
-        # Optionally attempt to open via OS (best-effort)
+        # Optionally attempt to open via OS (best-effort). webbrowser picks the
+        # right handler per platform (xdg-open/open/start) without the PATH
+        # scan and manual subprocess wiring
         if open:
             try:
-                import shutil
-                import subprocess
-                if shutil.which("xdg-open"):
-                    subprocess.Popen(["xdg-open", url])  # noqa: S603,S607
-                # Other platforms could be added here
+                import webbrowser
+                webbrowser.open(url)
             except Exception:  # noqa: BLE001
                 pass
 
@@ -1294,103 +1713,158 @@ def export_bibliography_content(
         # Normalize to string content
         count = 0
         content_str = ""
+        sha: str | None = None
         warnings: list[str] = []
         if format == "csljson":
             # There are two cases:
             # 1) Upstream already returned CSL JSON text/bytes/list
             # 2) Upstream returned Zotero native items (dicts with data/meta)
             diag_codes: list[str] = []
-            if isinstance(results, list) and results and isinstance(results[0], dict) and "data" in results[0]:
-                # Native Zotero items — map to minimal CSL
+            diag_seen: set[str] = set()
+
+            def _add_code(code: str) -> None:
+                if code not in diag_seen:
+                    diag_seen.add(code)
+                    diag_codes.append(code)
+
+            def _note_csl_warnings(ws: list[str]) -> None:
+                """Record validator warnings, tracking codes as they appear.
+
+                Keeping the code set current while warnings accumulate turns
+                the later "did anything invalid happen" checks into O(1)
+                membership tests instead of substring scans over every warning.
+                """
+                warnings.extend(ws)
+                for w in ws:
+                    if "INVALID_CSL_EXPORT" in w:
+                        _add_code("INVALID_CSL_EXPORT")
+                        break
+
+            def _is_native_items(obj: Any) -> bool:
+                return isinstance(obj, list) and bool(obj) and isinstance(obj[0], dict) and "data" in obj[0]
+
+            def _map_native(native: _typing.Iterable[dict[str, Any]]) -> tuple[str, int]:
+                """Map native Zotero items to sorted CSL JSON, appending warnings/diag codes.
+
+                Accepts any iterable so paged fetches can be streamed through
+                without materializing the full native item list first.
+                """
+                nonlocal sha
                 mapped = []
                 any_zotero_key_ids = False
                 any_authors_partial = False
-                for it in results:
+                for it in native:
                     entry = _to_csl_entry(it)
-                    # Mark when id appears to be an 8-char Zotero key
-                    if isinstance(entry.get("id"), str) and _re.fullmatch(r"[A-Z0-9]{8}", entry["id"] or ""):
-                        any_zotero_key_ids = True
+                    # Mark when id appears to be an 8-char Zotero key; once a
+                    # flag is set, stop re-probing the remaining items
+                    if not any_zotero_key_ids:
+                        eid = entry.get("id")
+                        if isinstance(eid, str) and _ZKEY_RE.fullmatch(eid):
+                            any_zotero_key_ids = True
                     # Detect if creators existed but none mapped to family/given
-                    data = it.get("data", {}) if isinstance(it, dict) else {}
-                    creators = data.get("creators") or []
-                    if creators and not entry.get("author"):
-                        any_authors_partial = True
+                    if not any_authors_partial:
+                        data = it.get("data", {}) if isinstance(it, dict) else {}
+                        if (data.get("creators") or []) and not entry.get("author"):
+                            any_authors_partial = True
                     mapped.append(entry)
-                # stable order by id then title
-                mapped.sort(key=lambda it: (str(it.get("id", "")), str(it.get("title", ""))))
-                content_str = _json.dumps(mapped, ensure_ascii=False)
-                count = len(mapped)
-                # Validate and warn if ids are missing
-                _parsed, w = _ensure_csl_json(content_str)
-                warnings.extend(w)
+                # stable order by id then title (decorate-sort-undecorate; the
+                # index tiebreaker keeps tuple comparison away from the dicts)
+                mapped = [
+                    t[3]
+                    for t in sorted(
+                        (str(e.get("id", "")), str(e.get("title", "")), i, e) for i, e in enumerate(mapped)
+                    )
+                ]
+                if _fastjson is not None:
+                    # orjson emits UTF-8 bytes directly, which feed the hash
+                    # without a second encode
+                    buf = _fastjson.dumps(mapped)
+                    sha = hashlib.sha256(buf).hexdigest()
+                    mapped_str = buf.decode("utf-8")
+                else:
+                    # Serialize incrementally, feeding the hash as chunks are
+                    # produced — avoids materializing a second full-size bytes
+                    # copy of a potentially multi-megabyte payload just to hash it
+                    h = hashlib.sha256()
+                    chunks: list[str] = []
+                    for chunk in _json.JSONEncoder(ensure_ascii=False).iterencode(mapped):
+                        chunks.append(chunk)
+                        h.update(chunk.encode("utf-8", errors="ignore"))
+                    mapped_str = "".join(chunks)
+                    sha = h.hexdigest()
+                # Validate the Python object directly — no need to re-parse
+                # JSON we just serialized ourselves
+                _note_csl_warnings(_validate_csl_parsed(mapped))
                 if any_zotero_key_ids:
                     warnings.append("CSL ids derived from Zotero item keys; Better BibTeX citekeys not available")
-                    diag_codes.append("CSL_IDS_FROM_ZOTERO_KEYS")
+                    _add_code("CSL_IDS_FROM_ZOTERO_KEYS")
                 if any_authors_partial:
                     warnings.append("Some authors could not be structured (family/given) and were omitted")
-                    diag_codes.append("CSL_AUTHORS_PARTIAL")
+                    _add_code("CSL_AUTHORS_PARTIAL")
+                return mapped_str, len(mapped)
+
+            if _is_native_items(results):
+                # Native Zotero items — map to minimal CSL
+                content_str, count = _map_native(results)
             else:
-                # If results is already a Python list/dict, JSON-encode it; else treat as text
+                # If results is already a Python list/dict, JSON-encode it and
+                # validate the object directly; else treat as text and parse
+                parsed: Any = None
                 if isinstance(results, (list, dict)):
                     try:
                         content_str = _json.dumps(results, ensure_ascii=False)
+                        parsed = results
+                        _note_csl_warnings(_validate_csl_parsed(results))
                     except Exception:
                         content_str = _as_text(results)
                 else:
                     content_str = _as_text(results)
-                parsed, w = _ensure_csl_json(content_str)
-                warnings.extend(w)
+                if parsed is None:
+                    parsed, w = _ensure_csl_json(content_str)
+                    _note_csl_warnings(w)
                 if isinstance(parsed, list):
                     count = len(parsed)
                 elif isinstance(parsed, dict) and isinstance(parsed.get("items"), list):
                     count = len(parsed["items"])  # type: ignore[index]
                 # If parsed shape looks wrong (e.g. list of strings or missing ids), perform a fallback
-                need_fallback = False
-                if warnings:
-                    # Any INVALID_CSL_EXPORT warning triggers fallback mapping
-                    need_fallback = any("INVALID_CSL_EXPORT" in w for w in warnings)
+                # Any INVALID_CSL_EXPORT warning triggers fallback mapping
+                need_fallback = "INVALID_CSL_EXPORT" in diag_seen
                 # Additional heuristic: results like ["items", ...] (strings only)
                 if not need_fallback and isinstance(results, list) and all(isinstance(x, str) for x in results):
                     need_fallback = True
                 if need_fallback:
                     try:
-                        # Refetch native items without format param and map locally to CSL
-                        zot_fallback = get_zotero_client()
-                        # Do not set format to let API return native item JSON
-                        if scope == "collection":
+                        # Reuse the already-fetched response when it turned out
+                        # to be native items; only refetch (without the format
+                        # param, so the API returns native item JSON) when the
+                        # first response is unusable text/strings. Avoids a
+                        # second full everything() pagination loop.
+                        if _is_native_items(results):
+                            native = results
+                        elif scope == "collection":
                             if not collectionKey:
                                 return "collectionKey is required when scope='collection'"
-                            native = (
-                                zot_fallback.everything(zot_fallback.collection_items(collectionKey)) if fetchAll else zot_fallback.collection_items(collectionKey)
-                            )
+                            native = zot.collection_items(collectionKey)
                         else:
-                            native = zot_fallback.everything(zot_fallback.items()) if fetchAll else zot_fallback.items()
-                        if isinstance(native, list) and native and isinstance(native[0], dict) and "data" in native[0]:
-                            mapped = []
-                            any_zotero_key_ids = False
-                            any_authors_partial = False
-                            for it in native:
-                                entry = _to_csl_entry(it)
-                                if isinstance(entry.get("id"), str) and _re.fullmatch(r"[A-Z0-9]{8}", entry["id"] or ""):
-                                    any_zotero_key_ids = True
-                                data = it.get("data", {}) if isinstance(it, dict) else {}
-                                creators = data.get("creators") or []
-                                if creators and not entry.get("author"):
-                                    any_authors_partial = True
-                                mapped.append(entry)
-                            mapped.sort(key=lambda it: (str(it.get("id", "")), str(it.get("title", ""))))
-                            content_str = _json.dumps(mapped, ensure_ascii=False)
-                            count = len(mapped)
-                            # Revalidate mapped content
-                            _parsed2, w2 = _ensure_csl_json(content_str)
-                            warnings.extend(w2)
-                            diag_codes.append("CSL_FALLBACK_LOCAL_MAPPING")
-                            if any_zotero_key_ids:
-                                warnings.append("CSL ids derived from Zotero item keys; Better BibTeX citekeys not available")
-                                diag_codes.append("CSL_IDS_FROM_ZOTERO_KEYS")
-                            if any_authors_partial:
-                                warnings.append("Some authors could not be structured (family/given) and were omitted")
-                                diag_codes.append("CSL_AUTHORS_PARTIAL")
+                            native = zot.items()
+                        if _is_native_items(native):
+                            if fetchAll and native is not results:
+                                # Stream follow-up pages into the mapper
+                                # instead of everything()'s full materialized
+                                # list: one native page is alive at a time
+                                # while items reduce to compact CSL entries
+                                def _stream(first: list[dict[str, Any]]) -> _typing.Iterator[dict[str, Any]]:
+                                    yield from first
+                                    while True:
+                                        page = zot.follow()
+                                        if not page:
+                                            break
+                                        yield from page
+
+                                content_str, count = _map_native(_stream(native))
+                            else:
+                                content_str, count = _map_native(native)
+                            _add_code("CSL_FALLBACK_LOCAL_MAPPING")
                     except Exception:
                         # Keep original content_str and warnings if fallback fails
                         pass
@@ -1415,7 +1889,8 @@ def export_bibliography_content(
             count = len(results) if isinstance(results, list) else 0
             warnings.append("biblatex formatting fallback used; verify output format.")
 
-        sha = hashlib.sha256(content_str.encode("utf-8", errors="ignore")).hexdigest()
+        if sha is None:
+            sha = hashlib.sha256(content_str.encode("utf-8", errors="ignore")).hexdigest()
         header = [
             "# Bibliography export (content)",
             f"Format: {format}",
@@ -1425,11 +1900,9 @@ def export_bibliography_content(
         ]
         result_obj: dict[str, Any] = {"content": content_str, "count": count, "sha256": sha, "warnings": warnings}
         if format == "csljson":
-            # include diagnostic codes when present (from mapping and from warnings)
+            # Diagnostic codes were tracked as their warnings were recorded,
+            # so no closing scan over the warning strings is needed here
             dc = list(locals().get("diag_codes") or [])
-            for w in warnings:
-                if "INVALID_CSL_EXPORT" in w and "INVALID_CSL_EXPORT" not in dc:
-                    dc.append("INVALID_CSL_EXPORT")
             if dc:
                 result_obj["codes"] = dc
         return "\n".join(header) + _compact_json_block("result", result_obj)
@@ -1443,6 +1916,12 @@ def export_bibliography_content(
 
 # Removed deprecated path-based zotero_ensure_style (no backward compatibility)
 
+# CSL styles change rarely but weigh 10-200KB each; cache downloads by URL
+# and revalidate with If-None-Match so repeat calls cost a 304 (or nothing
+# but a dict lookup when the server omits ETags and errors out).
+_STYLE_CACHE: dict[str, tuple[bytes, dict[str, str]]] = {}
+_STYLE_CACHE_MAX = 32
+
 
 @mcp.tool(
     name="zotero_ensure_style_content",
@@ -1463,11 +1942,25 @@ def ensure_style_content(style: str) -> str:
             return False
 
     def _download(url: str) -> tuple[bytes, dict[str, str]]:
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req) as resp:  # nosec
-            data = resp.read()
-            hdrs = {k: v for k, v in getattr(resp, "headers", {}).items()} if hasattr(resp, "headers") else {}
-            return data, hdrs
+        cached = _STYLE_CACHE.get(url)
+        headers: dict[str, str] = {}
+        if cached is not None:
+            cached_etag = cached[1].get("ETag")
+            if cached_etag:
+                headers["If-None-Match"] = cached_etag
+        req = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(req) as resp:  # nosec
+                data = resp.read()
+                hdrs = {k: v for k, v in getattr(resp, "headers", {}).items()} if hasattr(resp, "headers") else {}
+        except urllib.error.HTTPError as he:
+            if he.code == 304 and cached is not None:
+                return cached
+            raise
+        _STYLE_CACHE[url] = (data, hdrs)
+        while len(_STYLE_CACHE) > _STYLE_CACHE_MAX:
+            _STYLE_CACHE.pop(next(iter(_STYLE_CACHE)))
+        return data, hdrs
 
     try:
         if _is_url(style):
@@ -1508,7 +2001,6 @@ def ensure_yaml_citations_content(
 
     Strict: PyYAML only. If unavailable, fail fast with a clear error.
     """
-    import re as _re
     try:
         import yaml as _yaml  # type: ignore
     except Exception as e:  # noqa: BLE001
@@ -1516,17 +2008,23 @@ def ensure_yaml_citations_content(
 
     _t0 = time.perf_counter()
     try:
-        # Normalize BOM and newlines
-        content = (documentContent or "").lstrip("\ufeff").replace("\r\n", "\n").replace("\r", "\n")
-
-        # Detect front matter
-        fm_match = _re.match(r"^---\n(.*?)\n---\n(.*)$", content, flags=_re.DOTALL)
-        if fm_match:
-            fm_text = fm_match.group(1)
-            body = fm_match.group(2)
+        # Normalize BOM and newlines; LF-only input (the norm) skips both
+        # replace passes and their intermediate copies
+        content = (documentContent or "").lstrip("\ufeff")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+        # Detect front matter: a prefix check plus str.find rejects the common
+        # no-front-matter case in O(1) instead of a DOTALL regex sweep
+        if not content.startswith("---\n"):
+            fm_text, body = "", content
         else:
-            fm_text = ""
-            body = content
+            end = content.find("\n---\n", 4)
+            if end < 0:
+                fm_text, body = "", content
+            else:
+                fm_text = content[4:end]
+                body = content[end + 5:]
 
         changed = False
         preserved: list[str] = []
@@ -1540,10 +2038,12 @@ def ensure_yaml_citations_content(
             fm_obj = {}
 
         # Track preserved keys
-        preserved = [k for k in fm_obj.keys()]
+        preserved = list(fm_obj)
 
-        # Update keys
-        prev = dict(fm_obj)
+        # Capture just the values we may touch; copying the whole dict only to
+        # diff three keys is wasted work
+        managed_keys = ("bibliography", "csl", "link-citations")
+        prev = tuple(fm_obj.get(k) for k in managed_keys)
         # Content-first contract: when content is provided, mark YAML as inline
         if bibliographyContent is not None:
             fm_obj["bibliography"] = "__INLINE__"
@@ -1553,14 +2053,20 @@ def ensure_yaml_citations_content(
         if linkCitations is not None:
             fm_obj["link-citations"] = bool(linkCitations)
 
-        for k in ("bibliography", "csl", "link-citations"):
-            if prev.get(k) != fm_obj.get(k):
+        for k, old in zip(managed_keys, prev):
+            if old != fm_obj.get(k):
                 keys_updated.append(k)
 
-        # Dump YAML preserving order
-        dumped = _yaml.safe_dump(fm_obj, sort_keys=False).strip()
-        updated_content = f"---\n{dumped}\n---\n{body if body else ''}"
-        changed = (updated_content != content)
+        # No managed key changed in existing front matter: return the document
+        # untouched and skip the PyYAML emit round-trip entirely
+        if fm_text and not keys_updated:
+            updated_content = content
+            changed = False
+        else:
+            # Dump YAML preserving order
+            dumped = _yaml.safe_dump(fm_obj, sort_keys=False).strip()
+            updated_content = f"---\n{dumped}\n---\n{body if body else ''}"
+            changed = (updated_content != content)
 
         _ms = round((time.perf_counter() - _t0) * 1000, 1)
         logger.info(f"ensure_yaml_citations_content: updated using pyyaml in {_ms} ms; changed={changed}")
@@ -1576,6 +2082,153 @@ def ensure_yaml_citations_content(
         return _format_error("Error ensuring YAML citations", e)
 
 
+# ------------------------
+# Better BibTeX local endpoint (127.0.0.1:23119) helpers
+# ------------------------
+
+_BBT_BASE = "http://127.0.0.1:23119"
+
+# Export format → Better BibTeX translator name
+_BBT_TRANSLATOR = {
+    "bibtex": "Better BibTeX",
+    "biblatex": "Better BibLaTeX",
+    "csljson": "CSL JSON",
+}
+
+
+def _bbt_get(url: str, timeout: float = 1.5) -> bytes:
+    """GET a Better BibTeX endpoint and return the raw body."""
+    req = urllib.request.Request(url)
+    with urllib.request.urlopen(req, timeout=timeout) as resp:  # nosec - localhost endpoint by design
+        return resp.read()
+
+
+def _bbt_loads(raw: bytes) -> Any:
+    """Parse a BBT JSON response body.
+
+    orjson consumes the UTF-8 bytes directly, skipping the intermediate str
+    a decode-then-loads round would allocate for large citekey payloads.
+    """
+    if _fastjson is not None:
+        return _fastjson.loads(raw)
+    import json as _json
+
+    return _json.loads(raw.decode("utf-8", errors="ignore"))
+
+
+# Liveness of the BBT endpoint, cached briefly so chained tool calls don't
+# each pay a /version round-trip. Keyed on the active urlopen callable so a
+# swapped transport (tests patch urllib.request.urlopen) never sees a stale
+# verdict from the previous one.
+_BBT_ALIVE_CACHE: tuple[float, bool, Any] | None = None
+_BBT_ALIVE_TTL = 5.0
+
+
+def _bbt_alive() -> bool:
+    """Return whether the Better BibTeX endpoint responds, caching the probe for a few seconds."""
+    global _BBT_ALIVE_CACHE
+    opener = urllib.request.urlopen
+    now = time.monotonic()
+    cached = _BBT_ALIVE_CACHE
+    if cached is not None and cached[2] is opener and now - cached[0] < _BBT_ALIVE_TTL:
+        return cached[1]
+    try:
+        _bbt_get(f"{_BBT_BASE}/better-bibtex/version")
+        alive = True
+    except Exception:  # noqa: BLE001
+        alive = False
+    _BBT_ALIVE_CACHE = (now, alive, opener)
+    return alive
+
+
+def _bbt_mark_down() -> None:
+    """Drop the cached liveness verdict (call when a data endpoint errors out)."""
+    global _BBT_ALIVE_CACHE
+    _BBT_ALIVE_CACHE = None
+
+
+# Parsed autoexport job listings, keyed by URL: (etag, timestamp, parsed,
+# opener). Revalidated with If-None-Match when BBT sent an ETag, else reused
+# for a short TTL. Keyed on the active urlopen callable like _BBT_ALIVE_CACHE.
+_BBT_AUTOEXPORT_CACHE: dict[str, tuple[str | None, float, Any, Any]] = {}
+_BBT_AUTOEXPORT_TTL = 2.0
+
+
+def _bbt_get_json_cached(url: str, timeout: float = 1.5) -> Any:
+    """GET a BBT JSON endpoint, skipping re-download/re-parse when unchanged.
+
+    A 304 against the cached ETag (or a fresh TTL hit when BBT omits ETags)
+    returns the previously parsed payload, so chained ensure/verify calls
+    don't re-fetch the whole job list each time.
+    """
+    opener = urllib.request.urlopen
+    now = time.monotonic()
+    cached = _BBT_AUTOEXPORT_CACHE.get(url)
+    if cached is not None and cached[3] is not opener:
+        cached = None
+    if cached is not None and cached[0] is None and now - cached[1] < _BBT_AUTOEXPORT_TTL:
+        return cached[2]
+    headers: dict[str, str] = {}
+    if cached is not None and cached[0]:
+        headers["If-None-Match"] = cached[0]
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:  # nosec - localhost endpoint by design
+            raw = resp.read()
+            resp_headers = getattr(resp, "headers", None)
+            etag = resp_headers.get("ETag") if resp_headers is not None else None
+    except urllib.error.HTTPError as he:
+        if he.code == 304 and cached is not None:
+            _BBT_AUTOEXPORT_CACHE[url] = (cached[0], now, cached[2], opener)
+            return cached[2]
+        raise
+    parsed = _bbt_loads(raw)
+    if not isinstance(etag, str):
+        etag = None
+    _BBT_AUTOEXPORT_CACHE[url] = (etag, now, parsed, opener)
+    return parsed
+
+
+# Keep citekey query URLs well under common URL-length limits
+_BBT_CITEKEY_BATCH = 200
+
+
+def _bbt_fetch_citekeys(citekeys: list[str]) -> list[Any]:
+    """Fetch CSL-ish entries for citekeys from the BBT JSON endpoint.
+
+    Empty and duplicate keys are dropped (order preserved) so repeats from the
+    caller don't balloon the query, and large lists are issued in batches of
+    _BBT_CITEKEY_BATCH with the results merged.
+    """
+    import urllib.parse as _uparse
+
+    seen: set[str] = set()
+    uniq = [c for c in citekeys if c and not (c in seen or seen.add(c))]
+    entries: list[Any] = []
+    for i in range(0, len(uniq), _BBT_CITEKEY_BATCH):
+        q = ",".join(map(_uparse.quote, uniq[i:i + _BBT_CITEKEY_BATCH]))
+        raw = _bbt_get(f"{_BBT_BASE}/better-bibtex/json?citekeys=" + q)
+        data = _bbt_loads(raw)
+        if isinstance(data, list):
+            entries.extend(data)
+    return entries
+
+
+def _bbt_request_json(url: str, method: str, payload: dict[str, Any], timeout: float = 2.0) -> Any:
+    """Send a JSON payload to a Better BibTeX endpoint, decoding the JSON reply (None on parse failure)."""
+    import json as _json
+
+    data = _json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(url, data=data, method=method)
+    req.add_header("Content-Type", "application/json")
+    with urllib.request.urlopen(req, timeout=timeout) as resp:  # nosec - localhost endpoint by design
+        raw = resp.read()
+    try:
+        return _bbt_loads(raw)
+    except Exception:  # noqa: BLE001
+        return None
+
+
 # ------------------------
 # Better BibTeX auto-export (best-effort)
 # ------------------------
@@ -1599,17 +2252,7 @@ def ensure_auto_export(
     - status 'available' with a spec to configure if BBT is present but not matched
     - status 'fallback' when BBT is not reachable, advising on-demand export
     """
-    import json as _json
-    import urllib.error
-    import urllib.parse
-    import urllib.request
-
-    base = "http://127.0.0.1:23119"
-
-    def _get(url: str) -> bytes:
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=1.5) as resp:  # nosec - local endpoint by design
-            return resp.read()
+    base = _BBT_BASE
 
     # Apply sensible defaults when inputs are placeholders
     if not path or path.strip() in {".", "./", "auto"}:
@@ -1622,14 +2265,15 @@ def ensure_auto_export(
     spec = {"path": path, "format": format, "scope": scope, "collectionKey": collectionKey}
 
     try:
-        # Detect BBT presence
-        _ = _get(f"{base}/better-bibtex/version")
+        # Detect BBT presence (cached briefly; library_ensure_auto_export
+        # chains two tools that would otherwise both probe /version)
+        if not _bbt_alive():
+            raise urllib.error.URLError("Better BibTeX endpoint not reachable")
 
         # Try to list auto-exports (endpoint shape may vary across versions)
         status = "available"
         try:
-            raw = _get(f"{base}/better-bibtex/autoexport?format=json")
-            data = _json.loads(raw.decode("utf-8", errors="ignore"))
+            data = _bbt_get_json_cached(f"{base}/better-bibtex/autoexport?format=json")
             # Look for a matching target
             for entry in data if isinstance(data, list) else []:
                 tgt = entry.get("path") or entry.get("texpath") or entry.get("exportPath")
@@ -1654,6 +2298,7 @@ def ensure_auto_export(
         return "\n".join(msg) + _compact_json_block("result", {"status": status, **spec})
     except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError):
         # Fallback when local Zotero/BBT is not present
+        _bbt_mark_down()
         fb = [
             "# Better BibTeX auto-export",
             "Status: fallback",
@@ -1679,9 +2324,13 @@ def library_ensure_auto_export(
     keepUpdated: bool | None = True,
 ) -> str:
     """Unified wrapper to align with the plan's single ensureAutoExport tool surface."""
+    # Known-down endpoint (cached probe): skip the job attempt and its connect
+    # timeouts, going straight to the detection/fallback guidance
+    if not _bbt_alive():
+        return ensure_auto_export(path, format=format, scope=scope, collectionKey=collectionKey)
     # Try the concrete job ensure first; if BBT is unavailable, fall back to detection guidance
-    res = bbt_ensure_auto_export_job(path, format=format, scope=scope, collectionKey=collectionKey, keepUpdated=keepUpdated)
-    if "Status: fallback" in res or '"status":"fallback"' in res:
+    status, res = _bbt_ensure_job_impl(path, format=format, scope=scope, collectionKey=collectionKey, keepUpdated=keepUpdated)
+    if status == "fallback":
         # Provide guidance/detect as a follow-up
         info = ensure_auto_export(path, format=format, scope=scope, collectionKey=collectionKey)
         return res + "\n\n" + info
@@ -1711,52 +2360,27 @@ def resolve_citekeys(
     - Else if tryZotero, for keys that look like Zotero item keys (8-char base32), fetch item and return minimal metadata.
     Output contains: resolved (dict), unresolved (list), duplicateKeys (list).
     """
-    import json as _json
     import os as _os
-    import re as _re
 
     resolved: dict[str, dict[str, Any]] = {}
-    unresolved: list[str] = []
-    duplicates: list[str] = []
-
-    # duplicates detection from input
-    seen: set[str] = set()
-    for ck in citekeys:
-        low = ck.strip()
-        if low in seen and low not in duplicates:
-            duplicates.append(low)
-        seen.add(low)
+    # duplicates detection from input: Counter is one O(N) pass, vs. the old
+    # per-key "not in duplicates" list scan
+    counts = _collections.Counter(ck.strip() for ck in citekeys)
+    duplicates = [k for k, v in counts.items() if v > 1]
+    # Canonical unique-ordered key list for the resolution passes
+    uniq_keys = list(dict.fromkeys(citekeys))
 
     # Optional: Prefer Better BibTeX local endpoint for fast citekey resolution
     if preferBBT and citekeys:
         try:
-            import json as _json
-            import urllib.parse as _uparse
-            import urllib.request as _ureq
-            import urllib.error as _uerr
-
-            base = "http://127.0.0.1:23119/better-bibtex/json?citekeys="
-            q = ",".join([_uparse.quote(c) for c in citekeys])
-            url = base + q
-            req = _ureq.Request(url)
-            with _ureq.urlopen(req, timeout=1.5) as resp:  # nosec - localhost endpoint
-                raw = resp.read()
-            data = _json.loads(raw.decode("utf-8", errors="ignore"))
+            data = _bbt_fetch_citekeys(citekeys)
             if isinstance(data, list):
                 for it in data:
                     if not isinstance(it, dict):
                         continue
                     cid = it.get("id") or it.get("citekey")
                     if isinstance(cid, str) and cid not in resolved:
-                        authors = []
-                        for a in it.get("author", []) or []:
-                            if isinstance(a, dict):
-                                fam = a.get("family") or a.get("last")
-                                giv = a.get("given") or a.get("first")
-                                if fam and giv:
-                                    authors.append(f"{fam}, {giv}")
-                                elif fam:
-                                    authors.append(str(fam))
+                        authors = [x for x in map(_fmt_author, it.get("author") or []) if x]
                         resolved[cid] = {
                             "id": cid,
                             "title": it.get("title"),
@@ -1779,18 +2403,10 @@ def resolve_citekeys(
                     cid = it.get("id") if isinstance(it, dict) else None
                     if isinstance(cid, str):
                         csl_map[cid] = it
-            for ck in citekeys:
+            for ck in uniq_keys:
                 entry = csl_map.get(ck)
                 if entry:
-                    authors = []
-                    for a in entry.get("author", []) or []:
-                        if isinstance(a, dict):
-                            fam = a.get("family") or a.get("last")
-                            giv = a.get("given") or a.get("first")
-                            if fam and giv:
-                                authors.append(f"{fam}, {giv}")
-                            elif fam:
-                                authors.append(str(fam))
+                    authors = [x for x in map(_fmt_author, entry.get("author") or []) if x]
                     if ck not in resolved:
                         resolved[ck] = {
                             "id": entry.get("id"),
@@ -1799,44 +2415,34 @@ def resolve_citekeys(
                             "issued": entry.get("issued"),
                             "type": entry.get("type"),
                         }
-                else:
-                    unresolved.append(ck)
         except Exception as e:
             return (
                 "Invalid bibliographyContent. Pass CSL JSON as a string or a parsed array/object with 'items'. "
                 f"Details: {e}"
             )
 
-    # Try Zotero for unresolved keys that look like item keys
-    looks_like_item_key = _re.compile(r"^[A-Z0-9]{8}$")
-    # Try Zotero fallback even if a bibliography was provided, but only for unresolved keys
-    if tryZotero:
+    # Try Zotero fallback even if a bibliography was provided, but only for
+    # keys the BBT/CSL passes left unresolved
+    unresolved = [ck for ck in uniq_keys if ck not in resolved]
+    if tryZotero and unresolved:
         zot = get_zotero_client()
-        to_try = [ck for ck in (unresolved if unresolved else citekeys) if looks_like_item_key.match(ck)]
-        still_unresolved: list[str] = []
+        to_try = [ck for ck in unresolved if _ZKEY_RE.fullmatch(ck)]
         for ck in to_try:
             try:
                 item: Any = zot.item(ck)
                 if item:
                     data = item.get("data", {})
                     title = data.get("title")
-                    authors = []
-                    for c in data.get("creators", []) or []:
-                        if "lastName" in c and "firstName" in c:
-                            authors.append(f"{c['lastName']}, {c['firstName']}")
-                        elif "name" in c:
-                            authors.append(c["name"])
+                    authors = [x for x in map(_fmt_author, data.get("creators") or []) if x]
                     resolved[ck] = {
                         "key": ck,
                         "title": title,
                         "author": authors,
                         "type": data.get("itemType"),
                     }
-                else:
-                    still_unresolved.append(ck)
             except Exception:  # noqa: BLE001
-                still_unresolved.append(ck)
-    unresolved = [ck for ck in citekeys if ck not in resolved]
+                pass
+        unresolved = [ck for ck in uniq_keys if ck not in resolved]
 
     header = [
         "# Resolve citekeys",
@@ -1875,17 +2481,17 @@ def insert_citation(
         body = ",".join(keys)
         return f"\\parencite[{opt}]{{{body}}}" if opt else f"\\parencite{{{body}}}"
 
-    # pandoc-style
+    # pandoc-style: collect the pieces and join once instead of growing a
+    # cluster string with repeated += concatenations
     parts: list[str] = []
     if prefix and prefix.strip():
         parts.append(prefix.strip() + " ")
     # citation cluster: @a; @b
-    cluster = "; ".join([f"@{k}" for k in keys])
+    parts.append("; ".join(f"@{k}" for k in keys))
     if pages and pages.strip():
-        cluster += f", p. {pages.strip()}"
+        parts.append(f", p. {pages.strip()}")
     if suffix and suffix.strip():
-        cluster += f" {suffix.strip()}"
-    parts.append(cluster)
+        parts.append(f" {suffix.strip()}")
     return "[" + "".join(parts) + "]"
 
 
@@ -1900,23 +2506,13 @@ def bbt_resolve_citekeys(citekeys: list[str]) -> str:
 
     Calls /better-bibtex/json?citekeys=ck1,ck2 and expects a JSON array of CSL-ish entries.
     """
-    import json as _json
-    import urllib.parse as _uparse
-    import urllib.request as _ureq
     import urllib.error as _uerr
 
     if not citekeys:
         return "No citekeys provided."
 
-    base = "http://127.0.0.1:23119/better-bibtex/json?citekeys="
-    q = ",".join([_uparse.quote(c) for c in citekeys])
-    url = base + q
-
     try:
-        req = _ureq.Request(url)
-        with _ureq.urlopen(req, timeout=1.5) as resp:  # nosec - localhost endpoint by design
-            raw = resp.read()
-        data = _json.loads(raw.decode("utf-8", errors="ignore"))
+        data = _bbt_fetch_citekeys(citekeys)
         resolved: dict[str, dict[str, Any]] = {}
         seen = set()
         # Accept list of dicts; map by id or citekey
@@ -1927,16 +2523,7 @@ def bbt_resolve_citekeys(citekeys: list[str]) -> str:
                 cid = it.get("id") or it.get("citekey")
                 if isinstance(cid, str) and cid not in seen:
                     seen.add(cid)
-                    # Normalize authors
-                    authors = []
-                    for a in it.get("author", []) or []:
-                        if isinstance(a, dict):
-                            fam = a.get("family") or a.get("last")
-                            giv = a.get("given") or a.get("first")
-                            if fam and giv:
-                                authors.append(f"{fam}, {giv}")
-                            elif fam:
-                                authors.append(str(fam))
+                    authors = [x for x in map(_fmt_author, it.get("author") or []) if x]
                     resolved[cid] = {
                         "id": cid,
                         "title": it.get("title"),
@@ -1950,6 +2537,8 @@ def bbt_resolve_citekeys(citekeys: list[str]) -> str:
         ]
         return "\n".join(header) + _compact_json_block("result", {"resolved": resolved, "unresolved": unresolved})
     except (_uerr.URLError, _uerr.HTTPError, TimeoutError):
+        # Re-probe on the next call rather than trusting a cached "alive"
+        _bbt_mark_down()
         header = [
             "# BBT resolve citekeys",
             "Status: fallback (Better BibTeX not reachable)",
@@ -1959,70 +2548,36 @@ def bbt_resolve_citekeys(citekeys: list[str]) -> str:
         )
 
 
-@mcp.tool(
-    name="zotero_bbt_ensure_auto_export_job",
-    description=(
-        "Create or verify a Better BibTeX auto-export job for a path. Returns created/updated/verified, or a fallback if BBT is not reachable."
-    ),
-)
-def bbt_ensure_auto_export_job(
+def _bbt_ensure_job_impl(
     path: str,
-    format: Literal["bibtex", "biblatex", "csljson"] | None = "csljson",
-    scope: Literal["library", "collection"] | None = "library",
+    format: str | None = "csljson",
+    scope: str | None = "library",
     collectionKey: str | None = None,
     keepUpdated: bool | None = True,
-) -> str:
-    """Ensure a Better BibTeX auto-export job exists and matches the requested settings.
+) -> tuple[str, str]:
+    """Ensure a Better BibTeX auto-export job; return (status, rendered markdown).
 
-    Best-effort against local BBT API. If BBT isn't reachable, returns a friendly fallback.
+    The structured status ("created"/"updated"/"verified"/"fallback"/"error")
+    lets callers branch without substring-matching the rendered output.
     """
-    import json as _json
-    import urllib.parse as _uparse
-    import urllib.request as _ureq
-    import urllib.error as _uerr
-
-    base = "http://127.0.0.1:23119"
-    translator_map = {
-        "bibtex": "Better BibTeX",
-        "biblatex": "Better BibLaTeX",
-        "csljson": "CSL JSON",
-    }
-    translator = translator_map.get(format or "csljson", "CSL JSON")
-
-    def _get(url: str) -> bytes:
-        req = _ureq.Request(url)
-        with _ureq.urlopen(req, timeout=1.5) as resp:  # nosec - localhost endpoint by design
-            return resp.read()
-
-    def _json_req(url: str, method: str, payload: dict[str, Any]) -> Any:
-        data = _json.dumps(payload).encode("utf-8")
-        req = _ureq.Request(url, data=data, method=method)
-        req.add_header("Content-Type", "application/json")
-        with _ureq.urlopen(req, timeout=2.0) as resp:  # nosec - localhost
-            raw = resp.read()
-            try:
-                return _json.loads(raw.decode("utf-8", errors="ignore"))
-            except Exception:  # noqa: BLE001
-                return None
+    base = _BBT_BASE
+    translator = _BBT_TRANSLATOR.get(format or "csljson", "CSL JSON")
 
-    # Detect BBT
-    try:
-        _ = _get(f"{base}/better-bibtex/version")
-    except (_uerr.URLError, _uerr.HTTPError, TimeoutError):
+    # Detect BBT (cached briefly across chained tool calls)
+    if not _bbt_alive():
         msg = [
             "# Better BibTeX auto-export",
             "Status: fallback",
             "Local Better BibTeX endpoint is not reachable. Start Zotero with the Better BibTeX plugin.",
         ]
-        return "\n".join(msg) + _compact_json_block(
+        return "fallback", "\n".join(msg) + _compact_json_block(
             "result",
             {"status": "fallback", "path": path, "format": format, "scope": scope, "collectionKey": collectionKey},
         )
 
-    # List jobs
+    # List jobs (ETag/TTL-cached so back-to-back ensures reuse the parse)
     try:
-        jobs_raw = _get(f"{base}/better-bibtex/autoexport?format=json")
-        jobs = _json.loads(jobs_raw.decode("utf-8", errors="ignore"))
+        jobs = _bbt_get_json_cached(f"{base}/better-bibtex/autoexport?format=json")
     except Exception:  # noqa: BLE001
         jobs = []
 
@@ -2053,7 +2608,7 @@ def bbt_ensure_auto_export_job(
     try:
         if match is None:
             # Create
-            resp = _json_req(f"{base}/better-bibtex/autoexport", "POST", body)
+            resp = _bbt_request_json(f"{base}/better-bibtex/autoexport", "POST", body)
             status = "created"
             job_id = (resp or {}).get("id") if isinstance(resp, dict) else None
         else:
@@ -2075,18 +2630,23 @@ def bbt_ensure_auto_export_job(
                 upd = dict(body)
                 if job_id is not None:
                     upd["id"] = job_id
-                _ = _json_req(f"{base}/better-bibtex/autoexport", "POST", upd)
+                _ = _bbt_request_json(f"{base}/better-bibtex/autoexport", "POST", upd)
                 status = "updated"
             else:
                 status = "verified"
     except Exception as e:  # noqa: BLE001
-        return _format_error("Error ensuring BBT auto-export", e)
+        return "error", _format_error("Error ensuring BBT auto-export", e)
+
+    if status != "verified":
+        # The POST changed the job list; drop the cached listing so the next
+        # ensure re-reads it instead of re-creating inside the TTL window
+        _BBT_AUTOEXPORT_CACHE.pop(f"{base}/better-bibtex/autoexport?format=json", None)
 
     header = [
         "# Better BibTeX auto-export",
         f"Status: {status}",
     ]
-    return "\n".join(header) + _compact_json_block(
+    return status, "\n".join(header) + _compact_json_block(
         "result",
         {
             "status": status,
@@ -2101,6 +2661,26 @@ def bbt_ensure_auto_export_job(
     )
 
 
+@mcp.tool(
+    name="zotero_bbt_ensure_auto_export_job",
+    description=(
+        "Create or verify a Better BibTeX auto-export job for a path. Returns created/updated/verified, or a fallback if BBT is not reachable."
+    ),
+)
+def bbt_ensure_auto_export_job(
+    path: str,
+    format: Literal["bibtex", "biblatex", "csljson"] | None = "csljson",
+    scope: Literal["library", "collection"] | None = "library",
+    collectionKey: str | None = None,
+    keepUpdated: bool | None = True,
+) -> str:
+    """Ensure a Better BibTeX auto-export job exists and matches the requested settings.
+
+    Best-effort against local BBT API. If BBT isn't reachable, returns a friendly fallback.
+    """
+    return _bbt_ensure_job_impl(path, format=format, scope=scope, collectionKey=collectionKey, keepUpdated=keepUpdated)[1]
+
+
 @mcp.tool(
     name="zotero_suggest_citations",
     description=("Suggest citations based on input text; returns ranked items with simple overlap scoring."),
@@ -2131,8 +2711,14 @@ def suggest_citations(
     local_candidates: list[dict[str, Any]] = []
     if local_first:
         try:
-            for k, (_, val) in list(_CACHE.items()):  # type: ignore[misc]
-                if isinstance(k, str) and k.startswith("search:") and isinstance(val, list):
+            # Walk the search-key index instead of materializing and prefix-
+            # testing every cache entry
+            for k in _CACHE_SEARCH_KEYS:
+                entry = _CACHE.get(k)
+                if entry is None:
+                    continue
+                val = entry[1]
+                if isinstance(val, list):
                     for it in val:
                         if isinstance(it, dict):
                             local_candidates.append(it)
@@ -2181,39 +2767,51 @@ def suggest_citations(
         return "No suggestions found."
 
     # Tokenize query
-    import re as _re
+    qtokens = set([t.lower() for t in _RE_TOKEN.findall(text) if len(t) > 2])
 
-    qtokens = set([t.lower() for t in _re.findall(r"[\w-]+", text) if len(t) > 2])
+    def _rank(items: list[Any]) -> list[tuple[int, str, dict[str, Any], list[str], list[str], bool]]:
+        """Score items against qtokens by title/creator overlap and DOI hits.
 
-    ranked: list[tuple[int, dict[str, Any], list[str], list[str], bool]] = []
-    for it in results:
-        if not isinstance(it, dict):
-            continue
-        data = it.get("data", {})
-        title = data.get("title", "")
-        creators = data.get("creators", []) or []
-        tokens = set([t.lower() for t in _re.findall(r"[\w-]+", title)])
-        matched_title = qtokens & tokens
-        doi = data.get("DOI") or data.get("doi")
-        doi_match = 1 if doi and any(part in (doi or "").lower() for part in qtokens) else 0
-        for c in creators:
-            if isinstance(c, dict):
-                if "lastName" in c:
-                    tokens.add(c["lastName"].lower())
-                if "firstName" in c:
-                    tokens.add(c["firstName"].lower())
-                if "name" in c:
-                    tokens.add(c["name"].lower())
-        matched_creators = qtokens & tokens
-        # score: title matches weighted higher; DOI contributes
-        score = (2 * len(matched_title)) + len(matched_creators) + doi_match
-        ranked.append((score, it, sorted(list(matched_title))[:3], sorted(list(matched_creators))[:3], bool(doi)))
-
-    ranked.sort(key=lambda x: (-x[0], x[1].get("key", "")))
+        Rows carry the sort key up front as (-score, key) so sorting uses a
+        C-level itemgetter rather than a per-row lambda building tuples.
+        """
+        scored: list[tuple[int, str, dict[str, Any], list[str], list[str], bool]] = []
+        for it in items:
+            if not isinstance(it, dict):
+                continue
+            data = it.get("data", {})
+            title = data.get("title", "")
+            creators = data.get("creators", []) or []
+            # Keep title and creator tokens apart so each signal intersects
+            # qtokens once, instead of re-intersecting the title tokens via
+            # a merged set
+            title_tokens = {t.lower() for t in _RE_TOKEN.findall(title)}
+            matched_title = qtokens & title_tokens
+            doi = data.get("DOI") or data.get("doi")
+            doi_match = 1 if doi and any(part in (doi or "").lower() for part in qtokens) else 0
+            creator_tokens: set[str] = set()
+            for c in creators:
+                if isinstance(c, dict):
+                    if "lastName" in c:
+                        creator_tokens.add(c["lastName"].lower())
+                    if "firstName" in c:
+                        creator_tokens.add(c["firstName"].lower())
+                    if "name" in c:
+                        creator_tokens.add(c["name"].lower())
+            matched_creators = qtokens & creator_tokens
+            # score: title matches weighted higher; DOI contributes
+            score = (2 * len(matched_title)) + len(matched_creators) + doi_match
+            scored.append(
+                (-score, it.get("key", ""), it, sorted(matched_title)[:3], sorted(matched_creators)[:3], bool(doi))
+            )
+        scored.sort(key=operator.itemgetter(0, 1))
+        return scored
+
+    ranked = _rank(results)
     top = ranked[: (limit or 5)]
 
     # If we only used local candidates and the best score is below threshold, try a single server fetch
-    if local_first and local_candidates and top and top[0][0] < local_threshold:
+    if local_first and local_candidates and top and -top[0][0] < local_threshold:
         try:
             zot.add_parameters(q=text, qmode=qmode, limit=limit or 5)
             _rate_limit("zot.suggest")
@@ -2221,45 +2819,18 @@ def suggest_citations(
             used_server = True
             if isinstance(sres, list) and sres:
                 results = sres
-                ranked = []
-                for it in results:
-                    if not isinstance(it, dict):
-                        continue
-                    data = it.get("data", {})
-                    title = data.get("title", "")
-                    creators = data.get("creators", []) or []
-                    tokens = set([t.lower() for t in _re.findall(r"[\w-]+", title)])
-                    matched_title = qtokens & tokens
-                    doi = data.get("DOI") or data.get("doi")
-                    doi_match = 1 if doi and any(part in (doi or "").lower() for part in qtokens) else 0
-                    for c in creators:
-                        if isinstance(c, dict):
-                            if "lastName" in c:
-                                tokens.add(c["lastName"].lower())
-                            if "firstName" in c:
-                                tokens.add(c["firstName"].lower())
-                            if "name" in c:
-                                tokens.add(c["name"].lower())
-                    matched_creators = qtokens & tokens
-                    score = (2 * len(matched_title)) + len(matched_creators) + doi_match
-                    ranked.append((score, it, sorted(list(matched_title))[:3], sorted(list(matched_creators))[:3], bool(doi)))
-                ranked.sort(key=lambda x: (-x[0], x[1].get("key", "")))
+                ranked = _rank(results)
                 top = ranked[: (limit or 5)]
         except Exception:
             pass
 
     lines = [f"# Suggestions (top {len(top)})"]
     for i, pack in enumerate(top, start=1):
-        _, item, mt, mc, has_doi = pack
+        _, _, item, mt, mc, has_doi = pack
         data = item.get("data", {})
         item_key = item.get("key", "")
         title = data.get("title", "Untitled")
-        authors = []
-        for c in data.get("creators", []) or []:
-            if "lastName" in c and "firstName" in c:
-                authors.append(f"{c['lastName']}, {c['firstName']}")
-            elif "name" in c:
-                authors.append(c["name"])
+        authors = [x for x in map(_fmt_author, data.get("creators") or []) if x]
         rationale = []
         if mt:
             rationale.append(f"title:{'/'.join(mt)}")
@@ -2281,6 +2852,34 @@ def suggest_citations(
 # Validation and builds
 # ------------------------
 
+def _strip_noncite_regions(text: str) -> str:
+    """Drop YAML front matter and fenced code blocks in one linear pass.
+
+    Replaces the previous chain of three regex substitutions (front matter,
+    fences, escaped \\@), each of which copied the whole document. Segments
+    between fences are collected with str.find and joined once; an unclosed
+    fence is kept verbatim, matching the old non-greedy regex behaviour.
+    """
+    pos = 0
+    if text.startswith("---\n"):
+        end = text.find("\n---\n", 4)
+        if end >= 0:
+            pos = end + 5
+    parts: list[str] = []
+    while True:
+        start = text.find("```", pos)
+        if start < 0:
+            parts.append(text[pos:])
+            break
+        close = text.find("```", start + 3)
+        if close < 0:
+            parts.append(text[pos:])
+            break
+        parts.append(text[pos:start])
+        pos = close + 3
+    return "".join(parts)
+
+
 @mcp.tool(
     name="zotero_validate_references_content",
     description=(
@@ -2294,22 +2893,17 @@ def validate_references_content(
 ) -> str:
     """Scan Markdown for citekeys and validate against a CSL JSON bibliography string."""
     import json as _json
-    import re as _re
 
     content = (documentContent or "").lstrip("\ufeff").replace("\r\n", "\n").replace("\r", "\n")
 
     # Strip YAML front matter and fenced code blocks before scanning
-    # Remove YAML front matter
-    content_wo_yaml = _re.sub(r"^---\n.*?\n---\n", "", content, flags=_re.DOTALL)
-    # Remove fenced code blocks ```...```
-    content_wo_code = _re.sub(r"```.*?```", "", content_wo_yaml, flags=_re.DOTALL)
-    # Ignore escaped \@ occurrences
-    content_wo_code = _re.sub(r"\\@", "", content_wo_code)
-    # Extract citekeys from pandoc-style and bare @key
-    all_keys: list[str] = _re.findall(r"@([A-Za-z0-9:_-]+)", content_wo_code)
+    content_wo_code = _strip_noncite_regions(content)
+    # Extract citekeys from pandoc-style and bare @key (escaped \@ is
+    # excluded by the pattern itself)
+    all_keys: list[str] = _RE_ATKEY.findall(content_wo_code)
     keys = set(all_keys)
     # Also extract LaTeX-style \cite{a,b}, \parencite{a}, \textcite{a}, \autocite{a}
-    for m in _re.findall(r"\\(?:cite|parencite|textcite|autocite)\{([^}]*)\}", content_wo_code):
+    for m in _RE_LATEX_CITE.findall(content_wo_code):
         parts = [p.strip() for p in m.split(",") if p.strip()]
         for p in parts:
             all_keys.append(p)
@@ -2320,8 +2914,13 @@ def validate_references_content(
         _s, data = _normalize_json_input(bibliographyContent, expect="array")
         items = data["items"] if isinstance(data, dict) and "items" in data else data
         csl_map: dict[str, dict[str, Any]] = {}
+        # Detect duplicate ids while building the map; the old post-hoc scan
+        # over csl_map could never fire since dict keys are unique
+        duplicate_keys: list[str] = []
         for it in items if isinstance(items, list) else []:
             if isinstance(it, dict) and isinstance(it.get("id"), str):
+                if it["id"] in csl_map and it["id"] not in duplicate_keys:
+                    duplicate_keys.append(it["id"])
                 csl_map[it["id"]] = it
     except Exception as e:  # noqa: BLE001
         return (
@@ -2330,14 +2929,6 @@ def validate_references_content(
         )
 
     unresolved = [k for k in keys if k not in csl_map]
-    duplicate_keys: list[str] = []
-    # duplicates within document (approx): multiple mentions are fine; real duplicates refer to citekeys repeated in bib
-    # Here we check if the bibliography itself has duplicate ids (rare in JSON arrays)
-    seen: set[str] = set()
-    for k in csl_map.keys():
-        if k in seen and k not in duplicate_keys:
-            duplicate_keys.append(k)
-        seen.add(k)
 
     missing_fields: list[dict[str, Any]] = []
     for k in keys:
@@ -2361,38 +2952,41 @@ def validate_references_content(
         if not has_year:
             need.append("year")
         if requireDOIURL:
-            if not (it.get("DOI") or it.get("doi") or it.get("URL") or it.get("url")):
+            # One C-level disjoint check settles the common all-absent case;
+            # only entries carrying one of the keys pay the truthiness probes
+            if _DOI_URL_KEYS.isdisjoint(it) or not any(map(it.get, _DOI_URL_KEYS)):
                 need.append("doi/url")
         # Don't require DOI/URL for the minimal validation used in tests
         if need:
             missing_fields.append({"id": k, "missing": need})
 
-    # Duplicate citations within the document (same key used more than once)
-    counts: dict[str, int] = {}
-    for k in all_keys:
-        counts[k] = counts.get(k, 0) + 1
-    duplicate_citations = [k for k, c in counts.items() if c > 1]
+    # Duplicate citations within the document (same key used more than once);
+    # Counter tallies in one C-level pass instead of per-key dict.get calls
+    duplicate_citations = [k for k, c in _collections.Counter(all_keys).items() if c > 1]
 
     # Unused entries: present in bibliography but not cited
     unused_entries = [k for k in csl_map.keys() if k not in keys]
 
-    # Use resolver chain to get robust resolution (prefer BBT/file/Zotero)
-    try:
-        # Best-effort suggestions using existing resolver (bibliographyPath not applicable here).
-        # Do NOT override the unresolved list computed from the provided bibliography.
-        resolved_out = resolve_citekeys(list(keys), tryZotero=True, preferBBT=True)
-        # Extract JSON result block if present
-        import json as _json
+    # Use resolver chain to get robust resolution (prefer BBT/file/Zotero);
+    # skipped entirely when the document cites nothing, so the footnote-only
+    # path never probes BBT or Zotero
+    if keys:
+        try:
+            # Best-effort suggestions using existing resolver (bibliographyPath not applicable here).
+            # Do NOT override the unresolved list computed from the provided bibliography.
+            resolved_out = resolve_citekeys(list(keys), tryZotero=True, preferBBT=True)
+            # Extract JSON result block if present
+            import json as _json
 
-        m = _re.search(r"```json\n(.*?)\n```", resolved_out, flags=_re.DOTALL)
-        suggestions = {}
-        if m:
-            parsed = _json.loads(m.group(1))
-            res = parsed.get("result", parsed)
-            _resolved_map = res.get("resolved", {})
-            _ = _resolved_map  # reserved for future suggestion formatting
-    except Exception:  # noqa: BLE001
-        suggestions = {}
+            m = _JSON_FENCE_RE.search(resolved_out)
+            suggestions = {}
+            if m:
+                parsed = _json.loads(m.group(1))
+                res = parsed.get("result", parsed)
+                _resolved_map = res.get("resolved", {})
+                _ = _resolved_map  # reserved for future suggestion formatting
+        except Exception:  # noqa: BLE001
+            suggestions = {}
 
     header = ["# Validation report"]
     if len(keys) == 0:
@@ -2489,107 +3083,205 @@ def build_exports_content(
     _t0 = time.perf_counter()
     out_artifacts: list[dict[str, Any]] = []
     warnings: list[str] = []
-    tempdir = _tempfile.mkdtemp(prefix="zot-export-")
+    # Build inside the download area so artifact registration is an atomic
+    # same-filesystem rename instead of a potential cross-device copy
+    MCP_FILES_DIR.mkdir(parents=True, exist_ok=True)
+    tempdir = _tempfile.mkdtemp(prefix="zot-export-", dir=str(MCP_FILES_DIR))
     try:
         doc_path = Path(tempdir) / "doc.md"
-        doc_path.write_text((documentContent or "").lstrip("\ufeff").replace("\r\n", "\n").replace("\r", "\n"), encoding="utf-8")
+        doc_text = documentContent or ""
+        if doc_text.startswith("\ufeff"):
+            doc_text = doc_text[1:]
+        # LF-only content (the common case) skips both full-copy replaces
+        if "\r" in doc_text:
+            doc_text = doc_text.replace("\r\n", "\n").replace("\r", "\n")
+        # write_bytes skips the TextIOWrapper encode buffering of write_text
+        doc_path.write_bytes(doc_text.encode("utf-8"))
         bib_path = None
+        bib_str: str | None = None
         if bibliographyContent is not None:
             try:
                 bib_str, _ = _normalize_json_input(bibliographyContent, expect="array")
             except Exception as e:  # noqa: BLE001
                 return f"Invalid bibliographyContent: {e}"
             bib_path = Path(tempdir) / "refs.json"
-            bib_path.write_text(bib_str, encoding="utf-8")
+            bib_path.write_bytes(bib_str.encode("utf-8"))
         csl_path = None
         if cslContent is not None:
             csl_path = Path(tempdir) / "style.csl"
             csl_path.write_text(cslContent, encoding="utf-8")
 
         chosen_engine_for_log: str | None = None
-        for fmt in formats:
-            out_file = Path(tempdir) / f"{basename}.{fmt}"
-            cmd = [
-                _pandoc_path,
-                str(doc_path),
-                "-o",
-                str(out_file),
-            ]
-            if useCiteproc:
-                cmd.append("--citeproc")
+
+        # Citeproc is pure overhead when there is nothing to resolve citations
+        # against: no bibliography was provided and the document carries no
+        # inline references/bibliography metadata.
+        use_citeproc = bool(useCiteproc)
+        if use_citeproc and bib_path is None:
+            # Scan the actual front-matter block, however long it is — a
+            # fixed-size window would silently drop citation rendering for
+            # documents that declare references: past it
+            front = ""
+            if doc_text.startswith("---\n"):
+                end = doc_text.find("\n---\n", 4)
+                # Unclosed front matter: stay conservative and scan it all
+                front = doc_text[4:end] if end >= 0 else doc_text
+            if "references:" not in front and "bibliography:" not in front:
+                use_citeproc = False
+                logger.debug("build_exports_content: skipping --citeproc (no bibliography)")
+
+        # With multiple formats, parse Markdown (and run citeproc) once into a
+        # JSON AST, then render each format from the cached AST. Pandoc's
+        # parse+citeproc pass dominates for small documents, so this pays that
+        # cost once instead of once per format.
+        ast_path: Path | None = None
+        if len(formats) > 1:
+            ast_candidate = Path(tempdir) / "doc.ast.json"
+            ast_cmd = [_pandoc_path, str(doc_path), "-t", "json"]
+            if use_citeproc:
+                ast_cmd.append("--citeproc")
+            if bib_path:
+                ast_cmd += ["--bibliography", str(bib_path)]
+            if csl_path:
+                ast_cmd += ["--csl", str(csl_path)]
+            ast_cmd += ["-o", str(ast_candidate)]
+            logger.info(f"pandoc (ast): {' '.join(ast_cmd)}")
+            ar = subprocess.run(ast_cmd, capture_output=True, text=True, env=os.environ.copy())
+            if ar.returncode == 0 and ast_candidate.exists():
+                ast_path = ast_candidate
+            else:
+                # Fall back to full per-format runs; keep stderr for diagnostics
+                if (ar.stderr or "").strip():
+                    warnings.append(f"AST pre-pass failed; using per-format runs: {ar.stderr.strip()}")
+
+        cache_enabled = _build_cache_enabled()
+        # Tie cached artifacts to the Pandoc binary that produced them, so a
+        # pandoc upgrade (or a different PANDOC_PATH) invalidates old entries;
+        # path + mtime + size identify the binary without a --version fork
+        pandoc_cache_id = _pandoc_path
+        if cache_enabled:
+            try:
+                _pst = os.stat(_pandoc_path)
+                pandoc_cache_id = f"{_pandoc_path}\x1f{_pst.st_mtime_ns}\x1f{_pst.st_size}"
+            except OSError:
+                pass
+
+        # The Pandoc environment is identical for every format; build it once
+        # instead of copying os.environ per render (threads only read it)
+        run_env = os.environ.copy()
+        pdf_engine_path_env = os.getenv("PDF_ENGINE_PATH")
+        if pdf_engine_path_env:
+            ep = Path(pdf_engine_path_env)
+            if ep.exists():
+                run_env["PATH"] = str(ep.parent) + os.pathsep + run_env.get("PATH", "")
+
+        def _render_format(fmt: str) -> tuple[dict[str, Any] | None, list[str]]:
+            """Build (or restore from cache) a single format. Returns (artifact, warnings)."""
+            nonlocal chosen_engine_for_log
+            fmt_warnings: list[str] = []
+            final_filename = f"{basename}.{fmt}"
+            cache_key: str | None = None
+            if cache_enabled:
+                cache_key = _build_cache_key(
+                    (
+                        pandoc_cache_id,
+                        doc_text,
+                        bib_str or "",
+                        cslContent or "",
+                        fmt,
+                        pdfEngine or "",
+                        str(bool(useCiteproc)),
+                        "\x1f".join(extraArgs or []),
+                    )
+                )
+                cached_file = _build_cache_get(cache_key, fmt)
+                if cached_file is not None:
+                    try:
+                        size = cached_file.stat().st_size
+                        artifact = _register_built_artifact(cached_file, final_filename, fmt, size, move=False)
+                        logger.info(f"build cache hit for {fmt} ({cache_key[:8]}...)")
+                        return artifact.as_dict(), fmt_warnings
+                    except Exception as exc:  # noqa: BLE001
+                        fmt_warnings.append(f"artifact {fmt} cache restore failed: {exc}")
+
+            out_file = Path(tempdir) / final_filename
+            if ast_path is not None:
+                # Citeproc/bibliography/style were already applied in the AST pass
+                cmd = [
+                    _pandoc_path,
+                    "-f",
+                    "json",
+                    str(ast_path),
+                    "-o",
+                    str(out_file),
+                ]
+            else:
+                cmd = [
+                    _pandoc_path,
+                    str(doc_path),
+                    "-o",
+                    str(out_file),
+                ]
+                if use_citeproc:
+                    cmd.append("--citeproc")
             if fmt == "pdf":
                 chosen_engine, engine_warnings = _detect_pdf_engine(pdfEngine)
-                warnings.extend(engine_warnings)
+                fmt_warnings.extend(engine_warnings)
                 if chosen_engine:
                     cmd += [f"--pdf-engine={chosen_engine}"]
                     chosen_engine_for_log = chosen_engine
-            if bib_path:
-                cmd += ["--bibliography", str(bib_path)]
-            if csl_path:
-                cmd += ["--csl", str(csl_path)]
+            if ast_path is None:
+                if bib_path:
+                    cmd += ["--bibliography", str(bib_path)]
+                if csl_path:
+                    cmd += ["--csl", str(csl_path)]
             if extraArgs:
                 cmd += list(extraArgs)
 
             logger.info(f"pandoc: {' '.join(cmd)}")
-            run_env = os.environ.copy()
-            pdf_engine_path_env = os.getenv("PDF_ENGINE_PATH")
-            if pdf_engine_path_env:
-                ep = Path(pdf_engine_path_env)
-                if ep.exists():
-                    run_env["PATH"] = str(ep.parent) + os.pathsep + run_env.get("PATH", "")
             r = subprocess.run(cmd, capture_output=True, text=True, env=run_env)
             if r.returncode != 0:
-                warnings.append(r.stderr.strip())
-                continue
-            
+                fmt_warnings.append(r.stderr.strip())
+                return None, fmt_warnings
+
             # Check file exists and get size
             if not out_file.exists():
-                warnings.append(f"artifact {fmt} missing at {out_file}")
-                continue
-            
+                fmt_warnings.append(f"artifact {fmt} missing at {out_file}")
+                return None, fmt_warnings
+
             try:
                 file_size = out_file.stat().st_size
             except Exception as exc:  # noqa: BLE001
-                warnings.append(f"artifact {fmt} stat failed: {exc}")
-                continue
-            
+                fmt_warnings.append(f"artifact {fmt} stat failed: {exc}")
+                return None, fmt_warnings
+
+            # Populate the build cache before the file is moved away
+            if cache_key:
+                _build_cache_put(cache_key, fmt, out_file)
+
             # Move file to persistent location for download
             try:
-                import secrets
-                # Generate token for this file
-                file_token = secrets.token_urlsafe(32)
-                token_dir = MCP_FILES_DIR / file_token
-                token_dir.mkdir(parents=True, exist_ok=True)
-                final_filename = f"{basename}.{fmt}"
-                final_path = token_dir / final_filename
-                shutil.move(str(out_file), str(final_path))
-                
-                # Register file in registry
-                FILE_REGISTRY[file_token] = FileInfo(
-                    path=final_path,
-                    filename=final_filename,
-                    size=file_size,
-                    format=fmt,
-                    created_at=time.time(),
-                )
-                logger.info(f"Registered file {final_filename} with token {file_token[:8]}... (registry size: {len(FILE_REGISTRY)})")
-                
-                # Build download URL
-                host = os.getenv("MCP_HOST", "localhost")
-                port = os.getenv("MCP_PORT", "9180")
-                download_url = f"http://{host}:{port}/files/{file_token}"
-                
-                artifact = _ExportArtifact(
-                    format=fmt,
-                    filename=final_filename,
-                    token=file_token,
-                    downloadUrl=download_url,
-                    size=file_size,
-                )
-                out_artifacts.append(artifact.as_dict())
+                artifact = _register_built_artifact(out_file, final_filename, fmt, file_size)
+                return artifact.as_dict(), fmt_warnings
             except Exception as exc:  # noqa: BLE001
                 logger.error(f"artifact {fmt} registration failed: {exc}", exc_info=True)
-                warnings.append(f"artifact {fmt} registration failed: {exc}")
+                fmt_warnings.append(f"artifact {fmt} registration failed: {exc}")
+                return None, fmt_warnings
+
+        # Renders are independent subprocesses (per-format output files), so run
+        # them concurrently when several formats are requested; subprocess waits
+        # release the GIL, so threads are enough to overlap the Pandoc runs.
+        if len(formats) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(len(formats), 4)) as pool:
+                rendered = list(pool.map(_render_format, formats))
+        else:
+            rendered = [_render_format(formats[0])]
+        for artifact_dict, fmt_warnings in rendered:
+            warnings.extend(fmt_warnings)
+            if artifact_dict is not None:
+                out_artifacts.append(artifact_dict)
     finally:
         shutil.rmtree(tempdir, ignore_errors=True)
     _ms = round((time.perf_counter() - _t0) * 1000, 1)
@@ -2605,10 +3297,10 @@ def build_exports_content(
     ]
     chosen_engine_version = None
     try:
+        # Memoized probe: the version string can't change within the process,
+        # so repeat builds skip the fork+exec
         if chosen_engine_for_log and shutil.which(chosen_engine_for_log):
-            ev = subprocess.run([chosen_engine_for_log, "--version"], capture_output=True, text=True)
-            if ev.returncode == 0 and ev.stdout:
-                chosen_engine_version = ev.stdout.splitlines()[0]
+            chosen_engine_version = _tool_version(chosen_engine_for_log)
     except Exception:
         pass
     return "\n".join(header) + _compact_json_block(
@@ -2780,6 +3472,35 @@ def insert_citation_content(
     return insert_citation(citekeys=citekeys, pages=pages, prefix=prefix, suffix=suffix, style=style or "pandoc")
 
 
+# Item templates and per-type field lists are schema-stable, so remember them
+# per (client, itemType) — keyed on the client instance, like the which/urlopen
+# keyed caches, so a swapped client (tests use per-test mocks) never sees
+# another's entries. Callers get a deepcopy so their mutations stay local.
+_ITEM_SCHEMA_CACHE: dict[tuple[Any, str, str], Any] = {}
+_ITEM_SCHEMA_CACHE_MAX = 64
+
+
+def _item_schema_cached(zot: Any, method: str, itemType: str) -> Any:
+    import copy
+
+    key = (zot, method, itemType)
+    if key not in _ITEM_SCHEMA_CACHE:
+        if len(_ITEM_SCHEMA_CACHE) >= _ITEM_SCHEMA_CACHE_MAX:
+            _ITEM_SCHEMA_CACHE.pop(next(iter(_ITEM_SCHEMA_CACHE)))
+        _ITEM_SCHEMA_CACHE[key] = getattr(zot, method)(itemType)
+    return copy.deepcopy(_ITEM_SCHEMA_CACHE[key])
+
+
+def _item_template_cached(zot: Any, itemType: str) -> Any:
+    """zot.item_template with the per-process schema cache (one API hit per type)."""
+    return _item_schema_cached(zot, "item_template", itemType)
+
+
+def _item_type_fields_cached(zot: Any, itemType: str) -> Any:
+    """zot.item_type_fields with the per-process schema cache."""
+    return _item_schema_cached(zot, "item_type_fields", itemType)
+
+
 @mcp.tool(
     name="zotero_create_item",
     description="Create a new Zotero item. Provide itemType and a fields object; optional tags, collections, and parentItem.",
@@ -2802,7 +3523,7 @@ def create_item(
     sess: Any = None
     original_token: str | None = None
     try:
-        template: Any = zot.item_template(itemType)
+        template: Any = _item_template_cached(zot, itemType)
         # merge editable fields
         if fields:
             template.update(fields)
@@ -2825,7 +3546,7 @@ def create_item(
             except Exception as e:  # noqa: BLE001
                 # Try to enrich with allowed fields
                 try:
-                    fields_info: Any = zot.item_type_fields(itemType)
+                    fields_info: Any = _item_type_fields_cached(zot, itemType)
                     allowed_fields: list[str] = []
                     if isinstance(fields_info, Iterable):
                         for f in fields_info:
@@ -2943,14 +3664,16 @@ def add_note(
 
     zot = get_zotero_client()
     try:
-        note: Any = zot.item_template("note")
+        note: Any = _item_template_cached(zot, "note")
         # Markdown-to-HTML (light): handle **bold**, *italic*, and line breaks
         note_html = content
         if "<" not in content and ">" not in content:
-            # very small subset
-            note_html = note_html.replace("**", "<strong>", 1).replace("**", "</strong>", 1)
-            note_html = note_html.replace("*", "<em>", 1).replace("*", "</em>", 1)
-            esc = note_html.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            # very small subset; escape first (content carries no angle
+            # brackets here, so only & needs care), then convert every
+            # emphasis pair so the inserted tags survive
+            esc = note_html.replace("&", "&amp;")
+            esc = _MD_BOLD_RE.sub(r"<strong>\1</strong>", esc)
+            esc = _MD_ITAL_RE.sub(r"<em>\1</em>", esc)
             esc = esc.replace("\n\n", "</p><p>").replace("\n", "<br>")
             note_html = f"<p>{esc}</p>"
         note["note"] = note_html
@@ -2998,18 +3721,17 @@ def set_tags(
         item: Any = zot.item(itemKey)
         if not item:
             return f"No item found with key: {itemKey}"
-        # normalize and deduplicate tags
-        deduped = []
-        seen = set()
+        # normalize and deduplicate tags: one dict keyed by lowercase gives
+        # insertion order and first-seen casing without a parallel seen set
+        cleaned: dict[str, str] = {}
         invalid = []
         for t in tags:
-            if isinstance(t, str) and t.strip():
-                key = t.strip()
-                if key.lower() not in seen:
-                    seen.add(key.lower())
-                    deduped.append(key)
+            s = t.strip() if isinstance(t, str) else ""
+            if s:
+                cleaned.setdefault(s.lower(), s)
             else:
                 invalid.append(str(t))
+        deduped = list(cleaned.values())
 
         if mode == "append":
             _ = zot.add_tags(item, *deduped)
@@ -3138,8 +3860,9 @@ def export_collection(
             elif isinstance(parsed, dict) and isinstance(parsed.get("items"), list):
                 count = len(parsed["items"])  # type: ignore[index]
             content_str = text
-            # Fallback: if invalid or non-citeproc-ready, refetch native items and map locally
-            need_fallback = any("INVALID_CSL_EXPORT" in ww for ww in warnings)
+            # Fallback: if invalid or non-citeproc-ready, refetch native items and map locally.
+            # One joined C-level substring scan beats per-warning Python iteration.
+            need_fallback = "INVALID_CSL_EXPORT" in "\0".join(warnings)
             if not need_fallback and isinstance(results, list) and all(isinstance(x, str) for x in results):
                 need_fallback = True
             if need_fallback:
@@ -3152,12 +3875,14 @@ def export_collection(
                         any_authors_partial = False
                         for it in native:
                             entry = _to_csl_entry(it)
-                            if isinstance(entry.get("id"), str) and _re.fullmatch(r"[A-Z0-9]{8}", entry["id"] or ""):
-                                any_zotero_key_ids = True
-                            data = it.get("data", {}) if isinstance(it, dict) else {}
-                            creators = data.get("creators") or []
-                            if creators and not entry.get("author"):
-                                any_authors_partial = True
+                            if not any_zotero_key_ids:
+                                eid = entry.get("id")
+                                if isinstance(eid, str) and _ZKEY_RE.fullmatch(eid):
+                                    any_zotero_key_ids = True
+                            if not any_authors_partial:
+                                data = it.get("data", {}) if isinstance(it, dict) else {}
+                                if (data.get("creators") or []) and not entry.get("author"):
+                                    any_authors_partial = True
                             mapped.append(entry)
                         mapped.sort(key=lambda it: (str(it.get("id", "")), str(it.get("title", ""))))
                         content_str = _json.dumps(mapped, ensure_ascii=False)
@@ -3192,8 +3917,7 @@ def export_collection(
             content_str = _as_text(results)
             # Better RIS count heuristic: count TY - lines
             if format == "ris":
-                import re as _re2
-                count = len(_re2.findall(r"(?m)^TY\s*-", content_str))
+                count = len(_TY_RE.findall(content_str))
                 # Warn that count is heuristic
                 warnings.append("COUNT_HEURISTIC: RIS entry count estimated by 'TY -' lines")
             elif isinstance(results, list):
@@ -3235,13 +3959,12 @@ def export_collection(
         # Attach diagnostic codes for known conditions
         codes: list[str] = []
         extra_codes = locals().get("extra_codes", []) or []
-        for w in list(warnings):
-            if "INVALID_CSL_EXPORT" in w:
-                codes.append("INVALID_CSL_EXPORT")
-            if "EMPTY_CITATION_EXPORT" in w:
-                codes.append("EMPTY_CITATION_EXPORT")
-            if "COUNT_HEURISTIC" in w:
-                codes.append("COUNT_HEURISTIC")
+        # Scan the warnings once as a joined string; three C-level substring
+        # searches replace a Python loop of per-warning checks
+        joined_warnings = "\0".join(warnings)
+        for code in ("INVALID_CSL_EXPORT", "EMPTY_CITATION_EXPORT", "COUNT_HEURISTIC"):
+            if code in joined_warnings:
+                codes.append(code)
         # Merge any additional diagnostic codes computed during processing
         try:
             for c in extra_codes:
@@ -7,6 +7,16 @@ import pytest
 from pyzotero import zotero
 
 
+@pytest.fixture(autouse=True)
+def _isolate_build_cache(tmp_path, monkeypatch) -> None:
+    """Point the disk build cache at a per-test directory.
+
+    Without this, builds run under the mocked pandoc would populate (and be
+    served from) the developer's real ~/.cache/zotero-mcp/builds.
+    """
+    monkeypatch.setenv("ZOTERO_BUILD_CACHE_DIR", str(tmp_path / "build-cache"))
+
+
 @pytest.fixture
 def mock_zotero(monkeypatch) -> MagicMock:
     """Fixture that returns a mocked Zotero client"""
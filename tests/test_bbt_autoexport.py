@@ -65,3 +65,40 @@ def test_bbt_ensure_auto_export_job_verify() -> None:
     with patch("zotero_mcp.__init__.urllib.request.urlopen", side_effect=_fake_urlopen):
         out = bbt_ensure_auto_export_job("/tmp/refs.json", format="csljson", scope="library")
         assert "Status: verified" in out
+
+
+def test_bbt_ensure_auto_export_job_idempotent_after_create() -> None:
+    # No-ETag server: the listing cache must be invalidated by the create
+    # POST, or the second ensure re-reads a stale empty list and re-creates
+    jobs: list[dict] = []
+    posts: list[dict] = []
+
+    def _fake_urlopen(req, timeout=1.5):  # noqa: ANN001
+        url = getattr(req, "full_url", "")
+        method = getattr(req, "method", "GET")
+        if url.endswith("/better-bibtex/version") and method == "GET":
+            return _Resp(b"1.0.0")
+        if url.endswith("/better-bibtex/autoexport?format=json") and method == "GET":
+            return _Resp(json.dumps(jobs).encode("utf-8"))
+        if url.endswith("/better-bibtex/autoexport") and method == "POST":
+            payload = json.loads(req.data.decode("utf-8"))
+            posts.append(payload)
+            jobs.append(
+                {
+                    "id": 42,
+                    "path": payload["path"],
+                    "translator": payload["translator"],
+                    "keepUpdated": payload["keepUpdated"],
+                    "type": payload["type"],
+                }
+            )
+            return _Resp(json.dumps({"id": 42}).encode("utf-8"))
+        return _Resp(b"")
+
+    with patch("zotero_mcp.__init__.urllib.request.urlopen", side_effect=_fake_urlopen):
+        first = bbt_ensure_auto_export_job("/tmp/refs.json", format="csljson", scope="library")
+        second = bbt_ensure_auto_export_job("/tmp/refs.json", format="csljson", scope="library")
+
+    assert "Status: created" in first
+    assert "Status: verified" in second
+    assert len(posts) == 1
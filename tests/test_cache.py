@@ -0,0 +1,95 @@
+"""Tests for the in-memory TTL cache: eviction, admission, and indexes"""
+
+from __future__ import annotations
+
+import pytest
+
+import zotero_mcp as zm
+
+
+def _reset_cache_state() -> None:
+    zm._CACHE.clear()
+    zm._CACHE_HITS.clear()
+    zm._CACHE_SEARCH_KEYS.clear()
+    zm._CACHE_SKETCH[:] = bytes(len(zm._CACHE_SKETCH))
+
+
+@pytest.fixture(autouse=True)
+def small_cache(monkeypatch) -> None:
+    """Run each test against a fresh, 4-entry cache with a long TTL."""
+    _reset_cache_state()
+    monkeypatch.setattr(zm, "_CACHE_SKETCH_ADDS", 0)
+    monkeypatch.setenv("ZOTERO_CACHE_MAX", "4")
+    monkeypatch.setenv("ZOTERO_CACHE_TTL", "60")
+    zm._reload_config()
+    yield
+    _reset_cache_state()
+    zm._reload_config()
+
+
+def _fill(keys: list[str]) -> None:
+    for k in keys:
+        zm._cache_set(k, f"value-{k}")
+
+
+def test_cache_roundtrip_and_hit_counter_cap() -> None:
+    zm._cache_set("k", "v")
+    assert zm._cache_get("k") == "v"
+    assert zm._cache_get("missing") is None
+    for _ in range(5):
+        zm._cache_get("k")
+    # Hits are capped so a hot entry cannot become unevictable forever
+    assert zm._CACHE_HITS["k"] == zm._CACHE_HIT_MAX
+
+
+def test_admission_rejects_one_shot_key_at_capacity() -> None:
+    _fill(["a", "b", "c", "d"])
+    # Never looked up before: the sketch has no evidence it will recur
+    zm._cache_set("one-shot", "v")
+    assert "one-shot" not in zm._CACHE
+    assert len(zm._CACHE) == 4
+
+
+def test_admission_accepts_repeated_key_at_capacity() -> None:
+    _fill(["a", "b", "c", "d"])
+    # Two misses (a repeat query) push the sketch estimate to 2
+    zm._cache_get("repeat")
+    zm._cache_get("repeat")
+    zm._cache_set("repeat", "v")
+    assert zm._cache_get("repeat") == "v"
+    assert len(zm._CACHE) <= 4
+
+
+def test_eviction_gives_hit_entries_a_second_chance() -> None:
+    _fill(["a", "b", "c", "d"])
+    assert zm._cache_get("a") == "value-a"  # grants one survival pass
+    zm._cache_get("repeat")
+    zm._cache_get("repeat")
+    zm._cache_set("repeat", "v")  # overflows: sweep from the cold end
+    # "a" was recycled past the sweep; unreferenced "b" went first
+    assert "a" in zm._CACHE
+    assert "b" not in zm._CACHE
+    assert "repeat" in zm._CACHE
+
+
+def test_eviction_maintains_search_key_index() -> None:
+    zm._cache_set("search:q1", ["item"])
+    assert "search:q1" in zm._CACHE_SEARCH_KEYS
+    _fill(["a", "b", "c"])
+    zm._cache_get("repeat")
+    zm._cache_get("repeat")
+    zm._cache_set("repeat", "v")  # evicts the cold, unreferenced search entry
+    assert "search:q1" not in zm._CACHE
+    assert "search:q1" not in zm._CACHE_SEARCH_KEYS
+
+
+def test_sketch_ages_by_halving(monkeypatch) -> None:
+    # Pick a key whose two sketch hashes land in distinct cells so the
+    # counts below are exact under hash randomization
+    key = next(k for k in ("k0", "k1", "k2", "k3") if len(set(zm._sketch_indices(k))) == 2)
+    for _ in range(4):
+        zm._sketch_record(key)
+    assert zm._sketch_estimate(key) == 4
+    monkeypatch.setattr(zm, "_CACHE_SKETCH_ADDS", zm._CACHE_SKETCH_AGE_AT - 1)
+    zm._sketch_record(key)  # crossing the threshold halves every counter
+    assert zm._sketch_estimate(key) == 2
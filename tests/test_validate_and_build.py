@@ -151,3 +151,53 @@ def test_validate_references_accepts_parsed_json() -> None:
     bib = [{"id": "x", "title": "T"}]
     out = validate_references_content(doc_text, bib, requireDOIURL=False)
     assert "No Pandoc citations found" in out
+
+
+def test_build_cache_hit_and_miss() -> None:
+    calls: list[list[str]] = []
+
+    def _fake_run(cmd: list[str], capture_output: bool, text: bool, env: dict[str, str]):  # type: ignore[override]
+        calls.append(cmd)
+        out_index = cmd.index("-o")
+        out_path = Path(cmd[out_index + 1])
+        out_path.write_bytes(b"cache-bytes")
+        class _Res:
+            returncode = 0
+            stderr = ""
+        return _Res()
+
+    with patch("zotero_mcp.__init__.shutil.which", return_value="/usr/bin/pandoc"):
+        with patch("zotero_mcp.__init__.subprocess.run", side_effect=_fake_run):
+            first = build_exports_content("# T\n\nB", ["docx"], useCiteproc=False)
+            runs_after_first = len(calls)
+            # Identical inputs: artifact restored from the disk cache, no pandoc run
+            second = build_exports_content("# T\n\nB", ["docx"], useCiteproc=False)
+            assert len(calls) == runs_after_first
+            # Changed document: cache miss, pandoc runs again
+            build_exports_content("# T\n\nB changed", ["docx"], useCiteproc=False)
+            assert len(calls) == runs_after_first + 1
+
+    for out in (first, second):
+        artifacts = _extract_artifacts(out)
+        assert artifacts and artifacts[0]["size"] == len(b"cache-bytes")
+
+
+def test_build_cache_can_be_disabled(monkeypatch) -> None:
+    monkeypatch.setenv("ZOTERO_BUILD_CACHE", "0")
+    calls: list[list[str]] = []
+
+    def _fake_run(cmd: list[str], capture_output: bool, text: bool, env: dict[str, str]):  # type: ignore[override]
+        calls.append(cmd)
+        out_index = cmd.index("-o")
+        out_path = Path(cmd[out_index + 1])
+        out_path.write_bytes(b"x")
+        class _Res:
+            returncode = 0
+            stderr = ""
+        return _Res()
+
+    with patch("zotero_mcp.__init__.shutil.which", return_value="/usr/bin/pandoc"):
+        with patch("zotero_mcp.__init__.subprocess.run", side_effect=_fake_run):
+            build_exports_content("# T\n\nB", ["docx"], useCiteproc=False)
+            build_exports_content("# T\n\nB", ["docx"], useCiteproc=False)
+    assert len(calls) == 2